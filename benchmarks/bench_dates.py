@@ -0,0 +1,42 @@
+"""
+Compare `datetime.strptime` against the fixed-position parser used by
+`pyjne_peru.utils.parse_datetime`, and repeated access to a memoized date
+property.
+
+Usage::
+
+    python -m benchmarks.bench_dates [n_values]
+"""
+import sys
+import timeit
+
+from pyjne_peru.entities import Candidate
+from pyjne_peru.utils import _strptime, parse_datetime
+
+
+FORMAT = "%d/%m/%Y %H:%M:%S %p"
+
+
+def strptime_parse(value):
+    # the fallback of parse_datetime, on top of datetime.strptime
+    return _strptime(value, FORMAT)
+
+
+def report(label, seconds, n):
+    print(f"{label:<28} {seconds * 1e6 / n:.3f} us/value")
+
+
+def main(n=100000):
+    values = [f"{1 + i % 28:02d}/{1 + i % 12:02d}/19{50 + i % 50} 12:00:00 a. m." for i in range(n)]
+    report("strptime", timeit.timeit(lambda: [strptime_parse(v) for v in values], number=1), n)
+    report("parse_datetime", timeit.timeit(lambda: [parse_datetime(v, FORMAT) for v in values], number=1), n)
+
+    candidates = Candidate.parse_list([{"strFechaNacimiento": v} for v in values])
+    report("fechaNacimiento (first)", timeit.timeit(
+        lambda: [c.fechaNacimiento for c in candidates], number=1), n)
+    report("fechaNacimiento (memoized)", timeit.timeit(
+        lambda: [c.fechaNacimiento for c in candidates], number=1), n)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
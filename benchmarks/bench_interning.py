@@ -0,0 +1,35 @@
+"""
+Memory held by the strings of parsed entities, with and without an
+`InternTable`, for many copies of each payload as in a crawl.
+
+Usage::
+
+    python -m benchmarks.bench_interning [n_copies]
+"""
+import sys
+import timeit
+
+from benchmarks.payloads import load_payloads
+from pyjne_peru.interning import InternTable, memory_report
+from pyjne_peru.parsers import EntityParser
+
+
+def main(n=200):
+    for name, content in load_payloads().items():
+        payload_list = isinstance(EntityParser().decode(content).get("data"), list)
+        for parser in (EntityParser(), EntityParser(intern=InternTable())):
+            # decode every copy, as separate responses do not share strings
+            results = [
+                parser.parse(parser.decode(content), payload_list=payload_list, payload_type=name)
+                for _ in range(n)
+            ]
+            seconds = timeit.timeit(
+                lambda: parser.parse(parser.decode(content), payload_list=payload_list, payload_type=name),
+                number=20,
+            )
+            label = "interned" if parser.intern is not None else "plain"
+            print(f"{name:<14} {label:<8} {seconds * 1000 / 20:.3f} ms/payload  {memory_report(results)}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
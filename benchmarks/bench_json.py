@@ -0,0 +1,39 @@
+"""
+Compare the json backends available to `EntityParser` when decoding resume
+and file payloads.
+
+Usage::
+
+    python -m benchmarks.bench_json [--number 50] [--cassette fixtures/]
+"""
+import argparse
+import timeit
+
+from benchmarks.payloads import load_payloads
+from pyjne_peru.parsers import JSON_BACKENDS, get_json_loads
+from pyjne_peru.error import JNEException
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_json")
+    parser.add_argument("--cassette", help="directory of recorded responses")
+    parser.add_argument("--number", type=int, default=50, help="decodes per timing")
+    args = parser.parse_args(argv)
+    n = args.number
+    synthetic = load_payloads()
+    for name, content in load_payloads(args.cassette).items():
+        # payload types missing from the cassette keep their synthetic body
+        source = "synthetic" if content == synthetic[name] else f"cassette {args.cassette}"
+        print(f"{name:<14} payload: {source}")
+        for backend in JSON_BACKENDS:
+            try:
+                loads = get_json_loads(backend)
+            except JNEException:
+                print(f"{name:<14} {backend:<8} not installed")
+                continue
+            seconds = timeit.timeit(lambda: loads(content), number=n)
+            print(f"{name:<14} {backend:<8} {seconds * 1000 / n:.3f} ms/payload ({len(content)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare per-request latency of the module level ``requests.get`` (a new
+connection per call) against the pooled ``Transport`` used by ``JNE``.
+
+Usage::
+
+    python -m benchmarks.bench_transport [n_requests]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from pyjne_peru.transport import Transport
+
+
+PAYLOAD = json.dumps({"data": [{"idProcesoElectoral": 110}]}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, func, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<20} {n} requests  {elapsed * 1000 / n:.3f} ms/request")
+
+
+def main(n=500):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/Resoluciones/GetListProcesosCR"
+    try:
+        run("requests.get", lambda: requests.get(url, params={}, data={}), n)
+        with Transport() as transport:
+            run("Transport", lambda: transport.request("GET", url), n)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
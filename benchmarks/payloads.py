@@ -0,0 +1,97 @@
+"""
+Payloads used by the benchmarks: loaded from a cassette recorded with
+``python -m pyjne_peru.replay record`` when given, synthetic otherwise.
+"""
+import json
+from typing import Dict, Optional
+
+from pyjne_peru.replay import Cassette
+
+
+# endpoint path prefix of each payload type
+PAYLOAD_PATHS = {
+    "resume": "/HojaVida/GetHVConsolidado",
+    "file_extended": "/Expediente/BuscandoCodigo",
+    "file": "/Expediente/BusquedaReporteAvanzadoExpediente",
+    "candidate": "/Candidato/GetCandidatos",
+}
+
+
+def _section(n, **fields):
+    return [dict(fields, strDescripcion="DESCRIPCION " * 5, strAnio=str(2000 + i)) for i in range(n)]
+
+
+def resume_payload():
+    return {"data": {
+        "oDatosPersonales": {
+            "strNombres": "NOMBRES", "strApellidoPaterno": "PATERNO", "strApellidoMaterno": "MATERNO",
+            "strFechaNacimiento": "01/02/1980", "strFeTerminoRegistro": "01/02/2021 10:00:00",
+        },
+        "lBienInmueble": _section(5, strTengoInmueble="1"),
+        "lBienMueble": _section(5),
+        "lCargoPartidario": _section(3, strTengoCargoPartidario="1", strAnioCargoPartiDesde="2010"),
+        "lEduUniversitaria": _section(2, strAnioBachiller="2002"),
+        "lExperienciaLaboral": _section(8, strTengoExpeLaboral="1", strAnioTrabajoDesde="2005"),
+        "lRenunciaOP": _section(1),
+        "lSentenciaObliga": _section(1, strTengoSentenciaObliga="2"),
+        "lSentenciaPenal": _section(1, strTengoSentenciaPenal="2"),
+        "oEduBasica": {"strTengoEduBasica": "1"},
+        "oEduNoUniversitaria": {"strTengoNoUniversitaria": "2"},
+        "oEduPosgrago": {"strAnioPosgrado": "2010"},
+        "oEduTecnico": {"strTengoEduTecnico": "2"},
+        "oInfoAdicional": {"strInfoAdicional": ""},
+        "oIngresos": {"strTengoIngresos": "1", "decRemuBrutaPublico": 1000.0},
+    }}
+
+
+def file_item(i):
+    return {
+        "idExpediente": i, "idSolicitudLista": i, "idOrganizacionPolitica": i % 30,
+        "strOrganizacionPolitica": f"PARTIDO POLITICO {i % 30}", "strEstadoExpediente": "INSCRITO",
+        "strCodExpedienteExt": f"LEX-{i:05d}", "lParteProcesal": [{"strNombre": "PERSONA"}],
+    }
+
+
+def file_extended_payload():
+    return {"data": {
+        "oExpediente": file_item(1),
+        "lReporteBusquedaExpediente": [{"strDocumento": f"DOC {i}", "strFecha": "01/02/2021"} for i in range(30)],
+        "lCandidatosExpediente": [candidate_item(i) for i in range(30)],
+        "lAsociadosPadre": [file_item(i) for i in range(3)],
+        "lAsociadosHijos": [file_item(i) for i in range(3)],
+    }}
+
+
+def file_payload(n=2000):
+    return {"data": [file_item(i) for i in range(n)]}
+
+
+def candidate_item(i):
+    return {
+        "idHojaVida": i, "idOrganizacionPolitica": i % 30, "strOrganizacionPolitica": f"PARTIDO POLITICO {i % 30}",
+        "strCandidato": f"CANDIDATO {i}", "strDocumentoIdentidad": f"{i:08d}",
+        "strFechaNacimiento": f"{1 + i % 28:02d}/{1 + i % 12:02d}/19{50 + i % 50} 12:00:00 a. m.",
+    }
+
+
+def candidate_payload(n=130):
+    return {"data": [candidate_item(i) for i in range(n)]}
+
+
+SYNTHETIC_PAYLOADS = {
+    "resume": resume_payload,
+    "file_extended": file_extended_payload,
+    "file": file_payload,
+    "candidate": candidate_payload,
+}
+
+
+def load_payloads(cassette_path: Optional[str] = None) -> Dict[str, bytes]:
+    """Return the raw body of one payload per type."""
+    payloads = {name: json.dumps(func()).encode() for name, func in SYNTHETIC_PAYLOADS.items()}
+    if cassette_path:
+        for entry in Cassette(cassette_path):
+            for name, path in PAYLOAD_PATHS.items():
+                if entry["request"]["path"].startswith(path) and entry["status_code"] == 200:
+                    payloads[name] = entry["body"].encode("utf-8")
+    return payloads
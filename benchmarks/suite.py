@@ -0,0 +1,153 @@
+"""
+Reproducible benchmark suite for the transport, parsing and entity access
+hot paths. Results are written as json so two runs can be compared.
+
+Usage::
+
+    python -m benchmarks.suite --output results.json [--cassette fixtures/]
+    python -m benchmarks.suite --compare baseline.json results.json
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from benchmarks.payloads import PAYLOAD_PATHS, load_payloads
+from pyjne_peru import __version__
+from pyjne_peru.client import JNE
+from pyjne_peru.entities import Candidate, EntityFactory
+from pyjne_peru.parsers import EntityParser
+from pyjne_peru.replay import Cassette, StandInServer, request_key
+from pyjne_peru.transport import Transport
+
+
+def best_of(func: Callable, number: int, repeat: int = 5) -> float:
+    """Best time per call, in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def bench_parse(payloads: Dict[str, bytes], number: int) -> Dict[str, float]:
+    parser = EntityParser()
+    results = {}
+    for name, content in payloads.items():
+        json_payload = parser.decode(content)
+        payload_list = isinstance(json_payload.get("data"), list)
+        results[f"parse_{name}_per_sec"] = 1 / best_of(
+            lambda: parser.parse(json_payload, payload_list=payload_list, payload_type=name), number
+        )
+        results[f"decode_and_parse_{name}_per_sec"] = 1 / best_of(
+            lambda: parser.parse(parser.decode(content), payload_list=payload_list, payload_type=name), number
+        )
+    return results
+
+
+def bench_result_set(payloads: Dict[str, bytes], number: int) -> Dict[str, float]:
+    items = json.loads(payloads["file"])["data"]
+    seconds = best_of(lambda: EntityFactory.file.parse_list(items), number)
+    return {"result_set_items_per_sec": len(items) / seconds}
+
+
+def bench_dates(payloads: Dict[str, bytes], number: int) -> Dict[str, float]:
+    items = json.loads(payloads["candidate"])["data"]
+
+    def first_access():
+        for candidate in Candidate.parse_list(items):
+            candidate.fechaNacimiento
+
+    candidates = Candidate.parse_list(items)
+
+    def repeated_access():
+        for candidate in candidates:
+            candidate.fechaNacimiento
+
+    return {
+        "date_first_access_per_sec": len(items) / best_of(first_access, number),
+        "date_repeated_access_per_sec": len(items) / best_of(repeated_access, number),
+    }
+
+
+def bench_memory(payloads: Dict[str, bytes]) -> Dict[str, float]:
+    parser = EntityParser()
+    results = {}
+    for name, content in payloads.items():
+        json_payload = parser.decode(content)
+        payload_list = isinstance(json_payload.get("data"), list)
+        tracemalloc.start()
+        result = parser.parse(parser.decode(content), payload_list=payload_list, payload_type=name)
+        results[f"peak_memory_{name}_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del result
+    return results
+
+
+def bench_end_to_end(payloads: Dict[str, bytes], requests: int, workers: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cassette = Cassette(tmpdir)
+        path = PAYLOAD_PATHS["candidate"] + "/1-110-1-1"
+        cassette.save(request_key("GET", path), {"method": "GET", "path": path}, 200, payloads["candidate"])
+        with StandInServer(cassette) as server, JNE(
+            transport=Transport(pool_maxsize=workers), retry_policies={}
+        ) as client:
+            client.base_url = server.base_url
+            start = time.perf_counter()
+            with ThreadPoolExecutor(workers) as executor:
+                list(executor.map(lambda _: client.get_candidates_by_list(110, 1, 1, 1), range(requests)))
+            elapsed = time.perf_counter() - start
+    return {"end_to_end_requests_per_sec": requests / elapsed}
+
+
+def run(args) -> dict:
+    payloads = load_payloads(args.cassette)
+    results: Dict[str, float] = {}
+    results.update(bench_parse(payloads, args.number))
+    results.update(bench_result_set(payloads, args.number))
+    results.update(bench_dates(payloads, args.number))
+    results.update(bench_memory(payloads))
+    results.update(bench_end_to_end(payloads, args.requests, args.workers))
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+
+
+def compare(baseline_path: str, results_path: str):
+    with open(baseline_path) as baseline_file, open(results_path) as results_file:
+        baseline, results = json.load(baseline_file)["results"], json.load(results_file)["results"]
+    for name in sorted(set(baseline) & set(results)):
+        ratio = results[name] / baseline[name] if baseline[name] else float("nan")
+        # higher is better except for memory, changes under 5% are noise
+        better = ratio < 1 if name.endswith("_bytes") else ratio > 1
+        mark = "=" if abs(ratio - 1) < 0.05 else "+" if better else "-"
+        print(f"{name:<40} {baseline[name]:>14.1f} {results[name]:>14.1f}  x{ratio:.2f} {mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--output", help="write results to this json file")
+    parser.add_argument("--cassette", help="directory of recorded responses")
+    parser.add_argument("--number", type=int, default=20, help="calls per timing")
+    parser.add_argument("--requests", type=int, default=500, help="end-to-end requests")
+    parser.add_argument("--workers", type=int, default=8, help="end-to-end threads")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "RESULTS"))
+    args = parser.parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+    output = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Sequence, Tuple
+
+from .batch import BatchResult, run_batch_async
+from .cache import make_key
+from .client import JNE
+from .entities import Resume
+from .parsers import EntityParserResult
+from .transport import AsyncTransport
+from .utils import match_path_prefix
+
+
+class AsyncJNE(JNE):
+    """
+    asyncio flavour of the Plataforma Electoral JNE API
+
+    Exposes the same methods as ``JNE``; each of them returns a coroutine
+    that resolves to the same entities. At most ``max_concurrency`` requests
+    are in flight at the same time.
+    """
+
+    def __init__(
+        self,
+        parser=None,
+        transport=None,
+        cache=None,
+        cache_ttls=None,
+        rate_limiter=None,
+        retry_policies=None,
+        circuit_breaker=None,
+        single_flight=None,
+        snapshots=None,
+        max_concurrency: int = 100,
+        stream_prefetch: int = 0,
+    ):
+        super().__init__(
+            parser=parser,
+            transport=transport or AsyncTransport(),
+            cache=cache,
+            cache_ttls=cache_ttls,
+            rate_limiter=rate_limiter,
+            retry_policies=retry_policies,
+            circuit_breaker=circuit_breaker,
+            single_flight=single_flight,
+            snapshots=snapshots,
+            stream_prefetch=stream_prefetch,
+        )
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def close(self):
+        await self.transport.close()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' instead")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def get_resumes(  # type: ignore
+        self,
+        keys: Iterable[Tuple[int, int, int]],
+        max_workers: int = 8,
+        ordered: bool = True,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Fetch many resumes concurrently, see ``JNE.get_resumes``. An async
+        generator: ``async for result in client.get_resumes(keys)``.
+        """
+        async for result in run_batch_async(self.get_resume, keys, max_workers=max_workers, ordered=ordered):
+            yield result
+
+    async def get_resume_sections(  # type: ignore
+        self,
+        id_hoja_vida: int,
+        sections: Optional[Sequence[str]] = None,
+        order: str = "ASC",
+    ) -> Resume:
+        sections = self._get_section_names(sections)
+        # let every section finish before raising, no error is left unretrieved
+        results = await asyncio.gather(
+            *(getattr(self, f"get_resume_{section}")(id_hoja_vida, order) for section in sections),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        parsed: Dict[str, Any] = dict(zip(sections, results))
+        return self._build_resume(parsed)
+
+    async def get_resumes_sections(  # type: ignore
+        self,
+        ids_hoja_vida: Iterable[int],
+        sections: Optional[Sequence[str]] = None,
+        order: str = "ASC",
+        max_workers: int = 8,
+        ordered: bool = True,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Fetch the ``sections`` of many resumes, ``max_workers`` resumes at a
+        time, see ``JNE.get_resumes_sections``. An async generator.
+        """
+        sections = self._get_section_names(sections)
+
+        def get_resume_sections(id_hoja_vida: int):
+            return self.get_resume_sections(id_hoja_vida, sections, order)
+
+        async for result in run_batch_async(
+            get_resume_sections, ids_hoja_vida, max_workers=max_workers, ordered=ordered
+        ):
+            yield result
+
+    async def _make_request(  # type: ignore
+        self,
+        method: str,
+        path: str,
+        payload_type: Optional[str] = None,
+        payload_list: bool = False,
+        post_data: Optional[dict] = None,
+        params: Optional[dict] = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> EntityParserResult:
+        if stream:
+            # responses are read whole by ``AsyncTransport``
+            raise TypeError(f"AsyncJNE does not stream responses, call {method} {path} without stream=True")
+        if self.single_flight is None:
+            return await self._request(method, path, payload_type, payload_list, post_data, params)
+        result, shared = await self.single_flight.do_async(
+            make_key(method, path, params, post_data),
+            self._request, method, path, payload_type, payload_list, post_data, params,
+        )
+        if shared and self.hooks:
+            self._emit("coalesce", path)
+        return result
+
+    async def _request(  # type: ignore
+        self,
+        method: str,
+        path: str,
+        payload_type: Optional[str],
+        payload_list: bool,
+        post_data: Optional[dict],
+        params: Optional[dict],
+    ) -> EntityParserResult:
+        cache_key, ttl = self._get_cache_key(method, path, params, post_data)
+        json = self.cache.get(cache_key) if cache_key else None
+        if cache_key and self.hooks:
+            self._emit("cache", path, hit=json is not None)
+        if json is not None:
+            return self._parse(json, path, payload_list, payload_type)
+        response = await self._send(method, path, params, post_data)
+        return self._parse_response(
+            response, method, path, params, post_data, payload_list, payload_type, cache_key, ttl
+        )
+
+    async def _send(  # type: ignore
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        post_data: Optional[dict],
+        stream: bool = False,
+    ):
+        policy = match_path_prefix(self.retry_policies, path)
+        attempt = 0
+        while True:
+            try:
+                response = await self._send_once(method, path, params, post_data)
+            except Exception as exc:
+                delay = self._get_retry_delay(policy, method, attempt, error=exc)
+                if delay is None:
+                    raise
+            else:
+                delay = self._get_retry_delay(policy, method, attempt, response=response)
+                if delay is None:
+                    return response
+            if self.hooks:
+                self._emit("retry", path, attempt=attempt + 1, delay=delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_once(  # type: ignore
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        post_data: Optional[dict],
+        stream: bool = False,
+    ):
+        circuit_breaker, rate_limiter = self.circuit_breaker, self.rate_limiter
+        async with self.semaphore:
+            if circuit_breaker is not None:
+                circuit_breaker.before_request()
+            if rate_limiter is not None:
+                await rate_limiter.acquire_async()
+            start, ok = time.monotonic(), False
+            try:
+                response = await self.transport.request(
+                    method, self._build_url(path), params=params, data=post_data
+                )
+                ok = response.status_code < 500 and response.status_code != 429
+                if self.hooks:
+                    self._emit_response(path, method, response, time.monotonic() - start)
+                return response
+            except Exception as exc:
+                if self.hooks:
+                    self._emit("error", path, method=method, error=exc, elapsed=time.monotonic() - start)
+                raise
+            finally:
+                if rate_limiter is not None:
+                    rate_limiter.release(time.monotonic() - start, ok)
+                if circuit_breaker is not None:
+                    if ok:
+                        circuit_breaker.record_success()
+                    else:
+                        circuit_breaker.record_failure()
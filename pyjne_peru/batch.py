@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+
+class BatchResult(NamedTuple):
+    key: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _call(func: Callable, key: Any) -> Any:
+    if isinstance(key, tuple):
+        return func(*key)
+    return func(key)
+
+
+def _to_batch_result(key: Any, future: Union[Future, asyncio.Future]) -> BatchResult:
+    error = future.exception()
+    if error is not None:
+        return BatchResult(key, error=error)
+    return BatchResult(key, result=future.result())
+
+
+def run_batch(
+    func: Callable,
+    keys: Iterable[Any],
+    max_workers: int = 8,
+    ordered: bool = True,
+) -> Iterator[BatchResult]:
+    """
+    Call ``func`` for every key on a thread pool and yield a ``BatchResult``
+    per key. Tuple keys are unpacked as positional arguments.
+
+    Keys are consumed lazily: at most ``2 * max_workers`` calls are pending at
+    any time, so ``keys`` may be an arbitrarily large generator. An exception
+    raised by ``func`` is reported on its ``BatchResult`` and does not stop
+    the batch.
+    """
+    keys = iter(keys)
+    window = max_workers * 2
+    pending: Dict[Future, Any] = {}
+    order: deque = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit_next() -> bool:
+        for key in keys:
+            future = executor.submit(_call, func, key)
+            pending[future] = key
+            if ordered:
+                order.append(future)
+            return True
+        return False
+
+    try:
+        while len(pending) < window and submit_next():
+            pass
+        while pending:
+            done: Iterable[Future]
+            if ordered:
+                order[0].exception()  # wait for it
+                done = []
+                while order and order[0].done():
+                    done.append(order.popleft())
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            # hand out what already finished before pulling more keys
+            for future in done:
+                yield _to_batch_result(pending.pop(future), future)
+            while len(pending) < window and submit_next():
+                pass
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+async def run_batch_async(
+    func: Callable,
+    keys: Iterable[Any],
+    max_workers: int = 8,
+    ordered: bool = True,
+) -> AsyncIterator[BatchResult]:
+    """
+    asyncio flavour of ``run_batch``: ``func`` returns a coroutine, at most
+    ``max_workers`` of them run at the same time as tasks of the running
+    loop. Yields a ``BatchResult`` per key.
+    """
+    keys = iter(keys)
+    pending: Dict[asyncio.Future, Any] = {}
+    order: deque = deque()
+
+    def submit_next() -> bool:
+        for key in keys:
+            task = asyncio.ensure_future(_call(func, key))
+            pending[task] = key
+            if ordered:
+                order.append(task)
+            return True
+        return False
+
+    try:
+        while len(pending) < max_workers and submit_next():
+            pass
+        while pending:
+            done: Iterable[asyncio.Future]
+            if ordered:
+                await asyncio.wait([order[0]])
+                done = []
+                while order and order[0].done():
+                    done.append(order.popleft())
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # hand out what already finished before pulling more keys
+            for task in done:
+                yield _to_batch_result(pending.pop(task), task)
+            while len(pending) < max_workers and submit_next():
+                pass
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .utils import match_path_prefix
+
+
+# seconds to keep responses of each endpoint, matched by path prefix
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    "/Candidato/ListUbigeoDepartamento": 24 * 3600,
+    "/Resoluciones/GetListProcesosCR": 24 * 3600,
+    "/Candidato/GetTipoEleccionbyProceso": 24 * 3600,
+    "/Candidato/GetExpedientesLista": 3600,
+    "/Candidato/GetCandidatos": 3600,
+    "/HojaVida/": 3600,
+}
+
+
+def make_key(
+    method: str, path: str, params: Optional[dict] = None, post_data: Optional[dict] = None
+) -> str:
+    return json.dumps([method, path, params or {}, post_data or {}], sort_keys=True, default=str)
+
+
+def get_ttl(ttls: Dict[str, float], path: str) -> float:
+    """Return the TTL of the longest prefix of ``path`` found in ``ttls``, 0 if none."""
+    return match_path_prefix(ttls, path, default=0)
+
+
+class CacheStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+
+class BaseCache:
+    """Interface of response caches. Values are decoded JSON payloads."""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """In-memory LRU cache holding at most ``maxsize`` responses."""
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.time():
+                if item is not None:
+                    del self._data[key]
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return item[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache(BaseCache):
+    """
+    Persistent cache stored in a SQLite database, so responses survive
+    restarts. When ``maxsize`` is set, the least recently used responses are
+    evicted once a write goes over it. The row count is tracked by this
+    instance, so the database should not be shared with other writers.
+    """
+
+    def __init__(self, path: str = "pyjne_peru_cache.sqlite", maxsize: Optional[int] = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._count -= 1
+                self.stats.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float):
+        now = time.time()
+        with self._lock, self._conn:
+            exists = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now),
+            )
+            if exists is None:
+                self._count += 1
+            if self.maxsize is not None and self._count > self.maxsize:
+                # oldest first, walks the `accessed` index instead of sorting the table
+                evicted = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                    (self._count - self.maxsize,),
+                ).rowcount
+                self._count -= evicted
+                self.stats.evictions += evicted
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._count = 0
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._count
+
+
+class TieredCache(BaseCache):
+    """
+    Chain of caches checked in order, e.g. ``TieredCache(MemoryCache(), SQLiteCache())``.
+    A hit on a slower tier is copied into the faster ones.
+    """
+
+    def __init__(self, *tiers: BaseCache, promote_ttl: float = 300):
+        super().__init__()
+        self.tiers = tiers
+        self.promote_ttl = promote_ttl
+
+    def get(self, key: str) -> Any:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster in self.tiers[:index]:
+                    faster.set(key, value, self.promote_ttl)
+                self.stats.hits += 1
+                return value
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: float):
+        for tier in self.tiers:
+            tier.set(key, value, ttl)
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
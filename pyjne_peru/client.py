@@ -1,9 +1,38 @@
-from typing import Optional
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple, overload
 
-import requests
-
-from .parsers import EntityParser, EntityParserResult
+from .batch import BatchResult, run_batch
+from .cache import DEFAULT_CACHE_TTLS, get_ttl, make_key
+from .parsers import EntityListResult, EntityParser, EntityParserResult
+from .entities import Entity, ResultSet, Resume
 from .error import JNEException
+from .metrics import endpoint_label
+from .retry import DEFAULT_RETRY_POLICIES, RetryPolicy
+from .singleflight import SingleFlight
+from .snapshot import ResponseSnapshots, content_hash
+from .streaming import iter_json_array, prefetch
+from .transport import Transport
+from .utils import match_path_prefix
+
+logger = logging.getLogger(__name__)
+
+# resume sections with an endpoint of their own, name -> attribute at ``Resume``
+RESUME_SECTIONS: Dict[str, str] = {
+    "penal_sentence": "lSentenciaPenal",
+    "obligation_sentence": "lSentenciaObliga",
+    "university_education": "lEduUniversitaria",
+    "postgraduate_education": "oEduPosgrago",
+    "immovable_property": "lBienInmueble",
+    "movable_property": "lBienMueble",
+    "basic_education": "oEduBasica",
+    "non_university_education": "oEduNoUniversitaria",
+    "technical_education": "oEduTecnico",
+    "additional_information": "oInfoAdicional",
+    "professional_experience": "lExperienciaLaboral",
+    "partisan_position": "lCargoPartidario",
+    "resignation_political_organization": "lRenunciaOP",
+}
 
 
 class JNE:
@@ -11,13 +40,89 @@ class JNE:
     Plataforma Electoral JNE API
     """
 
-    def __init__(self, parser=None):
+    # threads fetching the sections of a single resume
+    max_section_workers = 16
+    # size of the chunks read from streamed responses
+    stream_chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        parser=None,
+        transport=None,
+        cache=None,
+        cache_ttls=None,
+        rate_limiter=None,
+        retry_policies=None,
+        circuit_breaker=None,
+        single_flight: Optional[SingleFlight] = None,
+        snapshots: Optional[ResponseSnapshots] = None,
+        stream_prefetch: int = 0,
+    ):
         self.base_url = "https://plataformaelectoral.jne.gob.pe"
         self.parser = parser or EntityParser()
+        # a ``Transport``, or an ``AsyncTransport`` for ``AsyncJNE``
+        self.transport: Any = transport or Transport()
+        self.cache = cache
+        self.cache_ttls = DEFAULT_CACHE_TTLS if cache_ttls is None else cache_ttls
+        self.rate_limiter = rate_limiter
+        # retry policies matched by path prefix, pass {} to disable retries
+        self.retry_policies = DEFAULT_RETRY_POLICIES if retry_policies is None else retry_policies
+        self.circuit_breaker = circuit_breaker
+        # coalesces concurrent identical requests, may be shared by clients
+        self.single_flight = single_flight
+        # skips decoding and parsing responses identical to the last ones
+        self.snapshots = snapshots
+        # entities of streamed responses decoded ahead of the consumer, on a
+        # background thread, 0 decodes them only as they are consumed
+        self.stream_prefetch = stream_prefetch
+        self.hooks: List[Callable[[str, dict], None]] = []
+
+    def close(self):
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def _build_url(self, path: str) -> str:
         return f"{self.base_url}{path}"
 
+    def add_hook(self, hook: Callable[[str, dict], None]):
+        """
+        Register ``hook(event, data)`` to be called on every request lifecycle
+        event: "response", "error", "retry", "cache", "coalesce", "snapshot",
+        "decode" and "parse".
+        ``data`` holds the ``endpoint`` label, the ``path`` and the details of
+        the event, e.g. ``elapsed`` seconds for timed phases.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[str, dict], None]):
+        self.hooks.remove(hook)
+
+    def _emit(self, event: str, path: str, **data):
+        data["endpoint"] = endpoint_label(path)
+        data["path"] = path
+        for hook in self.hooks:
+            try:
+                hook(event, data)
+            except Exception:
+                # a failing hook (e.g. metrics) must not fail the request
+                logger.exception("Hook %r failed on %r event", hook, event)
+
+    def _get_cache_key(
+        self, method: str, path: str, params: Optional[dict], post_data: Optional[dict]
+    ) -> Tuple[Optional[str], float]:
+        if self.cache is None:
+            return None, 0
+        ttl = get_ttl(self.cache_ttls, path)
+        if not ttl:
+            return None, 0
+        return make_key(method, path, params, post_data), ttl
+
+    @overload
     def _make_request(
         self,
         method: str,
@@ -26,23 +131,255 @@ class JNE:
         payload_list: bool = False,
         post_data: Optional[dict] = None,
         params: Optional[dict] = None,
+        stream: Literal[False] = False,
         **kwargs,
+    ) -> EntityParserResult: ...
+
+    @overload
+    def _make_request(
+        self,
+        method: str,
+        path: str,
+        payload_type: Optional[str] = None,
+        payload_list: bool = False,
+        post_data: Optional[dict] = None,
+        params: Optional[dict] = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> EntityListResult: ...
+
+    def _make_request(
+        self,
+        method: str,
+        path: str,
+        payload_type: Optional[str] = None,
+        payload_list: bool = False,
+        post_data: Optional[dict] = None,
+        params: Optional[dict] = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> EntityListResult:
+        if stream:
+            entities = self._stream_request(method, path, payload_type, post_data, params)
+            if self.stream_prefetch:
+                return prefetch(entities, self.stream_prefetch)
+            return entities
+        if self.single_flight is None:
+            return self._request(method, path, payload_type, payload_list, post_data, params)
+        result, shared = self.single_flight.do(
+            make_key(method, path, params, post_data),
+            self._request, method, path, payload_type, payload_list, post_data, params,
+        )
+        if shared and self.hooks:
+            self._emit("coalesce", path)
+        return result
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        payload_type: Optional[str],
+        payload_list: bool,
+        post_data: Optional[dict],
+        params: Optional[dict],
     ) -> EntityParserResult:
-        request_method = requests.post if method == "POST" else requests.get
-        response = request_method(  # type: ignore
-            self._build_url(path), params=params or {}, data=post_data or {}
+        cache_key, ttl = self._get_cache_key(method, path, params, post_data)
+        json = self.cache.get(cache_key) if cache_key else None
+        if cache_key and self.hooks:
+            self._emit("cache", path, hit=json is not None)
+        if json is not None:
+            return self._parse(json, path, payload_list, payload_type)
+        response = self._send(method, path, params, post_data)
+        return self._parse_response(
+            response, method, path, params, post_data, payload_list, payload_type, cache_key, ttl
+        )
+
+    def _parse_response(
+        self,
+        response,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        post_data: Optional[dict],
+        payload_list: bool,
+        payload_type: Optional[str],
+        cache_key: Optional[str],
+        ttl: float,
+    ) -> EntityParserResult:
+        """
+        Decode, cache and parse a response. With ``snapshots``, the last result
+        of the request is returned instead when the body did not change; the
+        body is then only decoded to refresh the cache entry, if any.
+        """
+        snapshots = self.snapshots
+        if snapshots is not None:
+            self._check_response(response)
+            snapshot_key = make_key(method, path, params, post_data)
+            digest = content_hash(response.content)
+            unchanged, result = snapshots.get(snapshot_key, digest)
+            if self.hooks:
+                self._emit("snapshot", path, unchanged=unchanged)
+            if unchanged:
+                if cache_key:
+                    self.cache.set(cache_key, self._decode_response(response, path), ttl)
+                return result
+        json = self._decode_response(response, path)
+        if cache_key:
+            self.cache.set(cache_key, json, ttl)
+        result = self._parse(json, path, payload_list, payload_type)
+        if snapshots is not None:
+            snapshots.set(snapshot_key, digest, result)
+        return result
+
+    def _parse(
+        self, json: dict, path: str, payload_list: bool, payload_type: Optional[str]
+    ) -> EntityParserResult:
+        if not self.hooks:
+            return self.parser.parse(json, payload_list=payload_list, payload_type=payload_type)
+        start = time.perf_counter()
+        result = self.parser.parse(json, payload_list=payload_list, payload_type=payload_type)
+        self._emit("parse", path, elapsed=time.perf_counter() - start, payload_type=payload_type)
+        return result
+
+    def _stream_request(
+        self,
+        method: str,
+        path: str,
+        payload_type: Optional[str],
+        post_data: Optional[dict],
+        params: Optional[dict],
+    ) -> Iterator[Optional[Entity]]:
+        """
+        Yield the entities at the ``data`` array of the response while it is
+        being downloaded. The request is sent on the first iteration.
+        """
+        response = self._send(method, path, params, post_data, stream=True)
+        try:
+            self._check_response(response)
+            items = iter_json_array(response.iter_content(self.stream_chunk_size))
+            yield from self.parser.iter_parse(items, payload_type)
+        finally:
+            response.close()
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        post_data: Optional[dict],
+        stream: bool = False,
+    ):
+        """Send the request, retrying transient failures as per the retry policy of ``path``."""
+        policy = match_path_prefix(self.retry_policies, path)
+        attempt = 0
+        while True:
+            try:
+                response = self._send_once(method, path, params, post_data, stream)
+            except Exception as exc:
+                delay = self._get_retry_delay(policy, method, attempt, error=exc)
+                if delay is None:
+                    raise
+            else:
+                delay = self._get_retry_delay(policy, method, attempt, response=response)
+                if delay is None:
+                    return response
+                response.close()
+            if self.hooks:
+                self._emit("retry", path, attempt=attempt + 1, delay=delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _get_retry_delay(
+        self,
+        policy: Optional[RetryPolicy],
+        method: str,
+        attempt: int,
+        response=None,
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """Return the seconds to wait before retrying, None to give up."""
+        if policy is None or not policy.can_retry(method, attempt):
+            return None
+        if error is not None:
+            if not isinstance(error, policy.retry_exceptions):
+                return None
+            return policy.get_backoff(attempt)
+        if response.status_code not in policy.retry_statuses:
+            return None
+        return policy.get_backoff(attempt, response.headers.get("Retry-After"))
+
+    def _send_once(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        post_data: Optional[dict],
+        stream: bool = False,
+    ):
+        """Send the request through the transport, within the rate limits and circuit breaker if any."""
+        kwargs = {"stream": True} if stream else {}
+        circuit_breaker, rate_limiter = self.circuit_breaker, self.rate_limiter
+        if circuit_breaker is not None:
+            circuit_breaker.before_request()
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        start, ok = time.monotonic(), False
+        try:
+            response = self.transport.request(
+                method, self._build_url(path), params=params, data=post_data, **kwargs
+            )
+            ok = response.status_code < 500 and response.status_code != 429
+            if self.hooks:
+                self._emit_response(path, method, response, time.monotonic() - start, stream)
+            return response
+        except Exception as exc:
+            if self.hooks:
+                self._emit("error", path, method=method, error=exc, elapsed=time.monotonic() - start)
+            raise
+        finally:
+            if rate_limiter is not None:
+                rate_limiter.release(time.monotonic() - start, ok)
+            if circuit_breaker is not None:
+                if ok:
+                    circuit_breaker.record_success()
+                else:
+                    circuit_breaker.record_failure()
+
+    def _emit_response(self, path: str, method: str, response, elapsed: float, stream: bool = False):
+        # requests measures from sending the request until the response
+        # headers are parsed: on a new connection, DNS and connect included
+        wait = getattr(response, "elapsed", None)
+        wait = wait.total_seconds() if wait is not None else None
+        # as sent, i.e. compressed; unknown for chunked responses
+        wire_bytes = response.headers.get("Content-Length")
+        self._emit(
+            "response",
+            path,
+            method=method,
+            status_code=response.status_code,
+            content_bytes=None if stream else len(response.content),
+            wire_bytes=int(wire_bytes) if wire_bytes and wire_bytes.isdigit() else None,
+            elapsed=elapsed,
+            wait=wait,
+            download=None if wait is None or stream else max(0.0, elapsed - wait),
         )
+
+    def _check_response(self, response):
         if response.status_code != 200:
             raise JNEException(
                 f"JNE error response: status code = {response.status_code}"
             )
 
-        result = self.parser.parse(
-            response.json(), payload_list=payload_list, payload_type=payload_type
-        )
-        return result
+    def _decode_response(self, response, path: str = "") -> dict:
+        self._check_response(response)
+        if not self.hooks:
+            return self.parser.decode(response.content)
+        start = time.perf_counter()
+        json = self.parser.decode(response.content)
+        self._emit("decode", path, elapsed=time.perf_counter() - start)
+        return json
 
-    def get_electoral_districts(self) -> EntityParserResult:
+    def get_electoral_districts(self, stream: bool = False) -> EntityListResult:
         """
         Note: Este metodo no devuelve todos los distritos electorales disponibles.
         Por ejemplo. PERUANOS RESIDENTES EN EL EXTERIOR (140101)
@@ -52,22 +389,27 @@ class JNE:
             "/Candidato/ListUbigeoDepartamento",
             payload_type="electoral_district",
             payload_list=True,
+            stream=stream,
         )
 
-    def get_election_processes(self) -> EntityParserResult:
+    def get_election_processes(self, stream: bool = False) -> EntityListResult:
         return self._make_request(
             "GET",
             "/Resoluciones/GetListProcesosCR",
             payload_type="election_process",
             payload_list=True,
+            stream=stream,
         )
 
-    def get_election_types_by_process(self, proceso_electoral: int) -> EntityParserResult:
+    def get_election_types_by_process(
+        self, proceso_electoral: int, stream: bool = False
+    ) -> EntityListResult:
         return self._make_request(
             "GET",
             f"/Candidato/GetTipoEleccionbyProceso/{proceso_electoral}",
             payload_type="election_type",
             payload_list=True,
+            stream=stream,
         )
 
     def get_files(
@@ -77,7 +419,12 @@ class JNE:
         proceso_electoral: int = 0,
         tipo_expediente: int = 0,
         ubigeo: str = "000000",
-    ) -> EntityParserResult:
+        stream: bool = False,
+    ) -> EntityListResult:
+        """
+        With ``stream=True`` returns an iterator of ``File`` decoded
+        incrementally from the response, instead of a ``ResultSet``.
+        """
         return self._make_request(
             "POST",
             "/Expediente/BusquedaReporteAvanzadoExpediente",
@@ -90,6 +437,7 @@ class JNE:
                 "idTipoExpediente": tipo_expediente,
                 "strUbigeo": ubigeo,
             },
+            stream=stream,
         )
 
     def get_files_on_list(
@@ -98,12 +446,13 @@ class JNE:
         tipo_eleccion: int,
         jurado_electoral: int = 0,
         distrito_electoral: int = 0,
-    ) -> EntityParserResult:
+        stream: bool = False,
+    ) -> EntityListResult:
         path = (
             f"/Candidato/GetExpedientesLista/"
             f"{proceso_electoral}-{tipo_eleccion}-{distrito_electoral or 'null'}------{jurado_electoral}-"
         )
-        return self._make_request("GET", path, payload_type="file", payload_list=True,)
+        return self._make_request("GET", path, payload_type="file", payload_list=True, stream=stream)
 
     def get_file(self, cod_expediente_ext: str) -> EntityParserResult:
         return self._make_request(
@@ -120,10 +469,11 @@ class JNE:
         tipo_eleccion: int,
         id_solicitud: int,
         id_expediente: int,
-    ) -> EntityParserResult:
+        stream: bool = False,
+    ) -> EntityListResult:
         path = f"/Candidato/GetCandidatos/{tipo_eleccion}-{proceso_electoral}-{id_solicitud}-{id_expediente}"
         return self._make_request(
-            "GET", path, payload_type="candidate", payload_list=True
+            "GET", path, payload_type="candidate", payload_list=True, stream=stream
         )
 
     def get_resume(
@@ -140,9 +490,106 @@ class JNE:
             payload_list=False,
         )
 
+    def get_resumes(
+        self,
+        keys: Iterable[Tuple[int, int, int]],
+        max_workers: int = 8,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        """
+        Fetch many resumes concurrently.
+
+        ``keys`` yields ``(id_hoja_vida, proceso_electoral, id_organizacion_poitica)``
+        tuples. Yields a ``BatchResult`` per key, holding either the ``Resume``
+        or the exception raised while fetching it. With ``ordered=False``
+        results are yielded as soon as they complete.
+        """
+        return run_batch(self.get_resume, keys, max_workers=max_workers, ordered=ordered)
+
+    def get_resume_sections(
+        self,
+        id_hoja_vida: int,
+        sections: Optional[Sequence[str]] = None,
+        order: str = "ASC",
+    ) -> Resume:
+        """
+        Fetch the ``sections`` of a resume (all of ``RESUME_SECTIONS`` by
+        default) concurrently and assemble them into a ``Resume``.
+        """
+        sections = self._get_section_names(sections)
+        if not sections:
+            return self._build_resume({})
+        result = next(self.get_resumes_sections(
+            [id_hoja_vida], sections, order, max_workers=min(len(sections), self.max_section_workers)
+        ))
+        if not result.ok:
+            raise result.error  # type: ignore
+        return result.result
+
+    def get_resumes_sections(
+        self,
+        ids_hoja_vida: Iterable[int],
+        sections: Optional[Sequence[str]] = None,
+        order: str = "ASC",
+        max_workers: int = 16,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        """
+        Fetch the ``sections`` of many resumes, sharing a pool of
+        ``max_workers`` threads among every section request.
+
+        Yields a ``BatchResult`` per id holding the assembled ``Resume``, or
+        the first exception raised while fetching one of its sections.
+        """
+        sections = self._get_section_names(sections)
+        keys = (
+            (position, id_hoja_vida, section)
+            for position, id_hoja_vida in enumerate(ids_hoja_vida)
+            for section in sections
+        )
+
+        def get_section(position: int, id_hoja_vida: int, section: str) -> EntityParserResult:
+            return getattr(self, f"get_resume_{section}")(id_hoja_vida, order)
+
+        pending: Dict[int, dict] = {}
+        for item in run_batch(get_section, keys, max_workers=max_workers, ordered=ordered):
+            position, id_hoja_vida, section = item.key
+            results = pending.setdefault(position, {})
+            results[section] = item
+            if len(results) == len(sections):
+                del pending[position]
+                errors = [results[name].error for name in sections if not results[name].ok]
+                if errors:
+                    yield BatchResult(id_hoja_vida, error=errors[0])
+                else:
+                    yield BatchResult(id_hoja_vida, result=self._build_resume(
+                        {name: results[name].result for name in sections}
+                    ))
+
+    @staticmethod
+    def _get_section_names(sections: Optional[Sequence[str]]) -> List[str]:
+        if sections is None:
+            return list(RESUME_SECTIONS)
+        for section in sections:
+            if section not in RESUME_SECTIONS:
+                raise JNEException(f'Unknown resume section: {section}')
+        return list(sections)
+
+    @staticmethod
+    def _build_resume(sections: Dict[str, EntityParserResult]) -> Resume:
+        """Assemble a ``Resume`` from the result sets of its section endpoints."""
+        resume = Resume()
+        for section, items in sections.items():
+            attribute = RESUME_SECTIONS[section]
+            if attribute.startswith("o"):
+                # single object sections are served as a one item list
+                items = items[0] if isinstance(items, ResultSet) and items else None
+            setattr(resume, attribute, items)
+        return resume
+
     def get_resume_personal_info(
-        self, id_hoja_vida: int, proceso_electoral: int, id_organizacion_poitica: int
-    ) -> EntityParserResult:
+        self, id_hoja_vida: int, proceso_electoral: int, id_organizacion_poitica: int, stream: bool = False
+    ) -> EntityListResult:
         params = {
             "param": f"{id_hoja_vida}-0-{id_organizacion_poitica}-{proceso_electoral}"
         }
@@ -152,6 +599,7 @@ class JNE:
             params=params,
             payload_type="personal_info",
             payload_list=True,
+            stream=stream,
         )
 
     def _get_section_at_resume(
@@ -160,7 +608,8 @@ class JNE:
         payload_type: str,
         id_hoja_vida: int,
         order: str = "ASC",
-    ) -> EntityParserResult:
+        stream: bool = False,
+    ) -> EntityListResult:
         params = {"Ids": f"{id_hoja_vida}-0-{order}"}
         return self._make_request(
             "GET",
@@ -168,73 +617,96 @@ class JNE:
             params=params,
             payload_type=payload_type,
             payload_list=True,
+            stream=stream,
         )
 
-    def get_resume_penal_sentence(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_penal_sentence(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVSentenciaPenal", "penal_sentence", id_hoja_vida, order
+            "GetAllHVSentenciaPenal", "penal_sentence", id_hoja_vida, order, stream
         )
 
-    def get_resume_obligation_sentence(self, id_hoja_vida, order: str = "ASC") -> EntityParserResult:
+    def get_resume_obligation_sentence(
+        self, id_hoja_vida, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVSentenciaObliga", "obligation_sentence", id_hoja_vida, order
+            "GetAllHVSentenciaObliga", "obligation_sentence", id_hoja_vida, order, stream
         )
 
-    def get_resume_university_education(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_university_education(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVEduUniversitaria", "university_education", id_hoja_vida, order
+            "GetAllHVEduUniversitaria", "university_education", id_hoja_vida, order, stream
         )
 
-    def get_resume_postgraduate_education(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_postgraduate_education(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVPosgrado", "postgraduate_education", id_hoja_vida, order
+            "GetAllHVPosgrado", "postgraduate_education", id_hoja_vida, order, stream
         )
 
-    def get_resume_immovable_property(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_immovable_property(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVBienInmueble", "immovable_property", id_hoja_vida, order
+            "GetAllHVBienInmueble", "immovable_property", id_hoja_vida, order, stream
         )
 
-    def get_resume_movable_property(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_movable_property(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVBienMueble", "movable_property", id_hoja_vida, order
+            "GetAllHVBienMueble", "movable_property", id_hoja_vida, order, stream
         )
 
-    def get_resume_basic_education(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_basic_education(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVEduBasica", "basic_education", id_hoja_vida, order
+            "GetAllHVEduBasica", "basic_education", id_hoja_vida, order, stream
         )
 
     def get_resume_non_university_education(
-        self, id_hoja_vida: int, order: str = "ASC"
-    ) -> EntityParserResult:
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVNoUniversitaria", "non_university_education", id_hoja_vida, order
+            "GetAllHVNoUniversitaria", "non_university_education", id_hoja_vida, order, stream
         )
 
-    def get_resume_technical_education(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_technical_education(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVEduTecnico", "technical_education", id_hoja_vida, order
+            "GetAllHVEduTecnico", "technical_education", id_hoja_vida, order, stream
         )
 
-    def get_resume_additional_information(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_additional_information(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVInfoAdicional", "additional_information", id_hoja_vida, order
+            "GetAllHVInfoAdicional", "additional_information", id_hoja_vida, order, stream
         )
 
-    def get_resume_professional_experience(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_professional_experience(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVExpeLaboral", "professional_experience", id_hoja_vida, order
+            "GetAllHVExpeLaboral", "professional_experience", id_hoja_vida, order, stream
         )
 
-    def get_resume_partisan_position(self, id_hoja_vida: int, order: str = "ASC") -> EntityParserResult:
+    def get_resume_partisan_position(
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetAllHVCargoPartidario", "partisan_position", id_hoja_vida, order
+            "GetAllHVCargoPartidario", "partisan_position", id_hoja_vida, order, stream
         )
 
     def get_resume_resignation_political_organization(
-        self, id_hoja_vida: int, order: str = "ASC"
-    ) -> EntityParserResult:
+        self, id_hoja_vida: int, order: str = "ASC", stream: bool = False
+    ) -> EntityListResult:
         return self._get_section_at_resume(
-            "GetHVRenunciaOP", "resignation_political_organization", id_hoja_vida, order
+            "GetHVRenunciaOP", "resignation_political_organization", id_hoja_vida, order, stream
         )
@@ -0,0 +1,257 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from .batch import run_batch
+from .entities import Candidate, ElectionType, File, Resume, TEntity, to_json_value
+from .workqueue import Task, WorkQueue
+
+
+class CandidateRecord(NamedTuple):
+    proceso_electoral: int
+    election_type: ElectionType
+    file: File
+    candidate: Candidate
+    resume: Optional[Resume] = None
+
+
+class Crawler:
+    """
+    Walks election types -> files on list -> candidates -> resumes for an
+    election process as a chain of generators.
+
+    Every stage runs on its own thread pool and pulls work from the stage
+    above as soon as it is produced, so the first records are yielded while
+    the rest of the election is still being fetched. Each stage keeps a
+    bounded number of pending calls, which bounds memory regardless of the
+    election size. Candidates repeated across lists are fetched once, keyed
+    by (id hoja de vida, id organizacion politica); only the last
+    ``seen_size`` keys are remembered, so the dedup is bounded too.
+
+    Errors are passed to ``on_error(stage, key, error)`` and the crawl goes
+    on with the remaining items.
+    """
+
+    def __init__(
+        self,
+        client,
+        file_workers: int = 4,
+        candidate_workers: int = 8,
+        resume_workers: int = 16,
+        with_resume: bool = True,
+        on_error: Optional[Callable[[str, Any, BaseException], None]] = None,
+        seen_size: int = 100_000,
+    ):
+        self.client = client
+        self.file_workers = file_workers
+        self.candidate_workers = candidate_workers
+        self.resume_workers = resume_workers
+        self.with_resume = with_resume
+        self.on_error = on_error
+        self.seen_size = seen_size
+
+    def _stage(self, name: str, func: Callable, keys: Iterable, max_workers: int) -> Iterator:
+        for batch_result in run_batch(func, keys, max_workers=max_workers, ordered=False):
+            error = batch_result.error
+            if error is None:
+                yield batch_result.key, batch_result.result
+            elif self.on_error is not None:
+                self.on_error(name, batch_result.key, error)
+
+    def election_types(self, proceso_electoral: int) -> Iterator[ElectionType]:
+        yield from self.client.get_election_types_by_process(proceso_electoral) or []
+
+    def files(self, proceso_electoral: int, election_types: Iterable[ElectionType]) -> Iterator[Tuple]:
+        def fetch(election_type):
+            return self.client.get_files_on_list(proceso_electoral, election_type.idTipoEleccion)
+
+        keys = ((election_type,) for election_type in election_types)
+        for (election_type,), files in self._stage("files", fetch, keys, self.file_workers):
+            for file in files or []:
+                yield election_type, file
+
+    def candidates(self, proceso_electoral: int, files: Iterable[Tuple]) -> Iterator[Tuple]:
+        def fetch(election_type, file):
+            return self.client.get_candidates_by_list(
+                proceso_electoral, election_type.idTipoEleccion, file.idSolicitudLista, file.idExpediente
+            )
+
+        seen: "OrderedDict[Tuple[Any, Any], None]" = OrderedDict()
+        for (election_type, file), candidates in self._stage(
+            "candidates", fetch, files, self.candidate_workers
+        ):
+            for candidate in candidates or []:
+                key = (candidate.idHojaVida, candidate.idOrganizacionPolitica)
+                if key in seen:
+                    seen.move_to_end(key)
+                    continue
+                seen[key] = None
+                if len(seen) > self.seen_size:
+                    seen.popitem(last=False)
+                yield election_type, file, candidate
+
+    def resumes(self, proceso_electoral: int, candidates: Iterable[Tuple]) -> Iterator[CandidateRecord]:
+        def fetch(election_type, file, candidate):
+            return self.client.get_resume(
+                candidate.idHojaVida, proceso_electoral, candidate.idOrganizacionPolitica
+            )
+
+        for (election_type, file, candidate), resume in self._stage(
+            "resumes", fetch, candidates, self.resume_workers
+        ):
+            yield CandidateRecord(proceso_electoral, election_type, file, candidate, resume)
+
+    def crawl(self, proceso_electoral: int) -> Iterator[CandidateRecord]:
+        election_types = self.election_types(proceso_electoral)
+        files = self.files(proceso_electoral, election_types)
+        candidates = self.candidates(proceso_electoral, files)
+        if not self.with_resume:
+            for election_type, file, candidate in candidates:
+                yield CandidateRecord(proceso_electoral, election_type, file, candidate)
+            return
+        yield from self.resumes(proceso_electoral, candidates)
+
+
+def _load(entity: Type[TEntity], json: dict) -> TEntity:
+    """Parse an entity stored at a task payload, never an empty object."""
+    instance = entity.parse(json)
+    if instance is None:
+        raise ValueError(f"Task payload without {entity.__name__}")
+    return instance
+
+
+class ResumableCrawler:
+    """
+    Crawler checkpointed on a ``WorkQueue``, so that a crawl interrupted at
+    any point is resumed where it stopped.
+
+    Every unit of work is a queue task: an election process, an election
+    type, a file and a hoja de vida. A unit is marked done together with the
+    units it produced, and a hoja de vida only once its ``CandidateRecord``
+    was consumed, so nothing is lost on a crash (at worst a record is yielded
+    twice). Deeper units are leased first, so records flow early and the
+    queue stays small.
+
+    Many crawlers, in other processes or machines, can share the queue: each
+    one leases units from it until no unit is pending or leased. Failed
+    units are retried by the queue up to its ``max_attempts``.
+    """
+
+    # unit kind -> lease priority
+    kinds = {"process": 0, "election_type": 1, "file": 2, "hoja_vida": 3}
+
+    def __init__(
+        self,
+        client,
+        queue: WorkQueue,
+        workers: int = 16,
+        with_resume: bool = True,
+        poll_interval: float = 1.0,
+        on_error: Optional[Callable[[str, Any, BaseException], None]] = None,
+    ):
+        self.client = client
+        self.queue = queue
+        self.workers = workers
+        self.with_resume = with_resume
+        self.poll_interval = poll_interval
+        self.on_error = on_error
+
+    def seed(self, proceso_electoral: int) -> bool:
+        """Queue the crawl of an election process, unless it already was."""
+        return self.queue.put(
+            "process", str(proceso_electoral), {"proceso_electoral": proceso_electoral},
+            self.kinds["process"],
+        )
+
+    def _child(self, kind: str, key: Tuple, **payload) -> Tuple[str, str, Any, int]:
+        return kind, "-".join(map(str, key)), to_json_value(payload), self.kinds[kind]
+
+    def _process(self, task: Task) -> Tuple[List[Tuple], List[CandidateRecord]]:
+        """Fetch the data of a unit, return the units it produced and its records."""
+        payload = task.payload
+        proceso_electoral = payload["proceso_electoral"]
+        if task.kind == "process":
+            election_types = self.client.get_election_types_by_process(proceso_electoral) or []
+            return [
+                self._child(
+                    "election_type", (proceso_electoral, election_type.idTipoEleccion),
+                    proceso_electoral=proceso_electoral, election_type=election_type,
+                )
+                for election_type in election_types if election_type is not None
+            ], []
+        election_type = _load(ElectionType, payload["election_type"])
+        if task.kind == "election_type":
+            files = self.client.get_files_on_list(proceso_electoral, election_type.idTipoEleccion) or []
+            return [
+                self._child(
+                    "file",
+                    (proceso_electoral, election_type.idTipoEleccion, file.idSolicitudLista, file.idExpediente),
+                    proceso_electoral=proceso_electoral, election_type=payload["election_type"], file=file,
+                )
+                for file in files if file is not None
+            ], []
+        file = _load(File, payload["file"])
+        if task.kind == "file":
+            candidates = self.client.get_candidates_by_list(
+                proceso_electoral, election_type.idTipoEleccion, file.idSolicitudLista, file.idExpediente
+            ) or []
+            # keyed by hoja de vida and organizacion politica, candidates repeated across lists are crawled once
+            return [
+                self._child(
+                    "hoja_vida", (proceso_electoral, candidate.idHojaVida, candidate.idOrganizacionPolitica),
+                    proceso_electoral=proceso_electoral, election_type=payload["election_type"],
+                    file=payload["file"], candidate=candidate,
+                )
+                for candidate in candidates if candidate is not None
+            ], []
+        candidate = _load(Candidate, payload["candidate"])
+        resume = None
+        if self.with_resume:
+            resume = self.client.get_resume(
+                candidate.idHojaVida, proceso_electoral, candidate.idOrganizacionPolitica
+            )
+        return [], [CandidateRecord(proceso_electoral, election_type, file, candidate, resume)]
+
+    def crawl(self, proceso_electoral: Optional[int] = None) -> Iterator[CandidateRecord]:
+        """
+        Seed ``proceso_electoral``, when given, and process the queue until
+        no work is left, yielding the records of the hojas de vida.
+        """
+        if proceso_electoral is not None:
+            self.seed(proceso_electoral)
+        queue = self.queue
+        pending: Dict[Future, Task] = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            while True:
+                if len(pending) < self.workers:
+                    for task in queue.lease(self.workers - len(pending)):
+                        pending[executor.submit(self._process, task)] = task
+                if not pending:
+                    counts = queue.counts()
+                    if not counts["pending"] and not counts["leased"]:
+                        return
+                    # units leased by other crawlers may still produce work
+                    time.sleep(self.poll_interval)
+                    continue
+                done, _ = wait(pending, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = pending[future]
+                    error = future.exception()
+                    if error is not None:
+                        queue.fail(task, error)
+                        if self.on_error is not None:
+                            self.on_error(task.kind, task.key, error)
+                    else:
+                        children, records = future.result()
+                        yield from records
+                        queue.complete(task, children)
+                    del pending[future]
+        finally:
+            # give back the units not completed, e.g. when the consumer stops early
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for task in pending.values():
+                queue.release(task)
@@ -1,130 +1,582 @@
-from typing import Any, Dict, Optional, Type, TypeVar, Union
+import threading
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, Hashable, Iterable, Iterator, Optional, Tuple, Type, TypeVar, Union
 
-from .utils import parse_date, parse_datetime
+from .utils import memoized_property, parse_date, parse_datetime
 
 
 TEntity = TypeVar('TEntity', bound='Entity')
 
 
-class ResultSet(list):
+def _invalidating(method: Callable) -> Callable:
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._invalidate()
+        return result
+    wrapper.__name__ = method.__name__
+    return wrapper
+
 
-    def __init__(self):
+class ResultSet(list):
+    """
+    List of entities with lazily built indexes and memoized views.
+
+    ``indexes`` declares which attributes are unique (``True``) or
+    multi-valued (``False``). Indexes are built on first lookup and then
+    kept up to date on ``append``; any other mutation drops them, as well as
+    the memoized views, to be rebuilt on next use. On unique indexes, the
+    first item with a given value wins. A multi-valued lookup on a unique
+    attribute (or the other way around) builds an index of that kind next
+    to the declared one. Lists returned by lookups and views are shared, do
+    not mutate them.
+    """
+
+    # read-only defaults while unpickling, when items are added before the state is set
+    _index_cache: Dict[Tuple[str, bool], dict] = MappingProxyType({})  # type: ignore
+    _view_cache: Dict[Hashable, list] = MappingProxyType({})  # type: ignore
+
+    def __init__(self, indexes: Optional[Dict[str, bool]] = None):
+        super().__init__()
         self.total = 0
+        self.indexes: Dict[str, bool] = dict(indexes or {})
+        self._index_cache = {}
+        self._view_cache = {}
+
+    def __getstate__(self):
+        # pickle, without the caches
+        state = dict(self.__dict__)
+        state["_index_cache"], state["_view_cache"] = {}, {}
+        return state
+
+    def _invalidate(self):
+        if self._index_cache:
+            self._index_cache.clear()
+        if self._view_cache:
+            self._view_cache.clear()
+
+    @staticmethod
+    def _add_to_index(index: dict, attribute: str, unique: bool, item):
+        if item is None:
+            return
+        value = getattr(item, attribute)
+        if unique:
+            index.setdefault(value, item)
+        else:
+            index.setdefault(value, []).append(item)
+
+    def append(self, item):
+        super().append(item)
+        if self._view_cache:
+            self._view_cache.clear()
+        for (attribute, unique), index in self._index_cache.items():
+            self._add_to_index(index, attribute, unique, item)
+
+    # other mutations drop indexes and views
+    extend = _invalidating(list.extend)
+    insert = _invalidating(list.insert)
+    remove = _invalidating(list.remove)
+    pop = _invalidating(list.pop)
+    clear = _invalidating(list.clear)
+    sort = _invalidating(list.sort)
+    reverse = _invalidating(list.reverse)
+    __setitem__ = _invalidating(list.__setitem__)
+    __delitem__ = _invalidating(list.__delitem__)
+    __iadd__ = _invalidating(list.__iadd__)
+    __imul__ = _invalidating(list.__imul__)
+
+    def get_index(self, attribute: str, unique: Optional[bool] = None) -> dict:
+        """
+        Return the index of ``attribute``: value -> item if ``unique``, value
+        -> list of items otherwise; of the declared kind when ``unique`` is
+        None. Undeclared attributes are declared here, as given by ``unique``.
+        """
+        if attribute not in self.indexes:
+            self.indexes[attribute] = bool(unique)
+        if unique is None:
+            unique = self.indexes[attribute]
+        index = self._index_cache.get((attribute, unique))
+        if index is None:
+            groups = self._index_cache.get((attribute, False))
+            if unique and groups is not None:
+                # the first item of each group, as when built from the items
+                index = {value: items[0] for value, items in groups.items()}
+            else:
+                index = {}
+                for item in self:
+                    self._add_to_index(index, attribute, unique, item)
+            self._index_cache[(attribute, unique)] = index
+        return index
+
+    def get_by(self, attribute: str, value: Any, default: Any = None) -> Any:
+        """Return the item whose unique ``attribute`` equals ``value``."""
+        return self.get_index(attribute, unique=True).get(value, default)
+
+    def filter_by(self, attribute: str, value: Any) -> list:
+        """Return the items whose ``attribute`` equals ``value``."""
+        return self.get_index(attribute, unique=False).get(value, [])
+
+    def group_by(self, attribute: str) -> Dict[Any, list]:
+        """Return the items grouped by the value of ``attribute``."""
+        return self.get_index(attribute, unique=False)
+
+    def where(self, **conditions) -> list:
+        """
+        Return (memoized) the items matching every ``attribute=value``
+        condition, all of them when there are no conditions.
+        """
+        key = ("where",) + tuple(sorted(conditions.items()))
+        result = self._view_cache.get(key)
+        if result is None:
+            if conditions:
+                (attribute, value), *others = sorted(conditions.items())
+                result = [
+                    item for item in self.filter_by(attribute, value)
+                    if all(getattr(item, k) == v for k, v in others)
+                ]
+            else:
+                result = list(self)
+            self._view_cache[key] = result
+        return result
+
+    def view(self, name: Hashable, predicate: Callable[[Any], bool]) -> list:
+        """Return (memoized under ``name``) the items for which ``predicate`` is true."""
+        result = self._view_cache.get(name)
+        if result is None:
+            result = self._view_cache[name] = [item for item in self if predicate(item)]
+        return result
 
 
 class ResultSetWithEmptyItems(ResultSet):
 
-    def __init__(self, empty_item_comparison_attribute: str, empty_item_comparison_value: Union[str, int]):
-        super().__init__()
+    def __init__(
+        self,
+        empty_item_comparison_attribute: str,
+        empty_item_comparison_value: Union[str, int],
+        indexes: Optional[Dict[str, bool]] = None,
+    ):
+        super().__init__(indexes)
         self.empty_item_comparison_attribute = empty_item_comparison_attribute
         self.empty_item_comparison_value = empty_item_comparison_value
 
     @property
     def exclude_empty_item(self):
-        return [item for item in self if getattr(item, self.empty_item_comparison_attribute) != self.empty_item_comparison_value]
+        attribute, value = self.empty_item_comparison_attribute, self.empty_item_comparison_value
+        return self.view("exclude_empty_item", lambda item: getattr(item, attribute) != value)
 
 
 # TODO: Find a better way to do this
 TResultSets = Union[ResultSet, ResultSetWithEmptyItems]
 
 
-class Entity:
+class EntityMeta(type):
+    """
+    Give every entity class a ``__slots__`` layout built from its known
+    fields: the names listed at ``fields``, the keys of ``extra_parsers`` and
+    ``empty_item_comparison_attribute``. Fields not known in advance are kept
+    at the ``_extra`` overflow mapping.
+
+    Entities parsed with ``lazy=True`` keep the raw json of the fields with
+    extra parsers at ``_raw``; each one is parsed on first access.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        inherited: Tuple[str, ...] = tuple(
+            field for base in bases for field in getattr(base, "_fields", ())
+        )
+        if "__slots__" not in namespace:
+            known = list(namespace.get("fields", ()))
+            known.extend(namespace.get("extra_parsers") or ())
+            if namespace.get("empty_item_comparison_attribute"):
+                known.append(namespace["empty_item_comparison_attribute"])
+            own = tuple(dict.fromkeys(field for field in known if field not in inherited))
+            namespace["__slots__"] = own
+        else:
+            own = ()
+        cls = super().__new__(mcs, name, bases, namespace)
+        cls._fields = inherited + own
+        cls._compiled_parser = None
+        cls._compiled_lazy_parser = None
+        cls._compiled_interning_parser = None
+        cls._compiled_lazy_interning_parser = None
+        return cls
+
+
+# key of ``_raw`` holding the intern function of the lazy sections
+_RAW_INTERN = "__intern__"
+# serializes the parsing of lazy sections, entities may be shared between threads
+_LAZY_LOCK = threading.RLock()
+
+
+class Entity(metaclass=EntityMeta):
+    __slots__ = ("_extra", "_raw", "_memo")
+    fields: Tuple[str, ...] = ()
     empty_item_comparison_attribute: Optional[str] = None
     empty_item_comparison_value: Union[str, int, None] = None
     extra_parsers: Optional[Dict[str, Any]] = None
+    # indexes of the result sets of this entity, attribute -> unique
+    result_set_indexes: Optional[Dict[str, bool]] = None
+    # set by ``EntityMeta``, and by ``_compile_parser`` for the builder
+    _fields: ClassVar[Tuple[str, ...]]
+    _builder: ClassVar[EntityMeta]
+    _compiled_parser: ClassVar[Optional[Callable]]
+    _compiled_lazy_parser: ClassVar[Optional[Callable]]
+    _compiled_interning_parser: ClassVar[Optional[Callable]]
+    _compiled_lazy_interning_parser: ClassVar[Optional[Callable]]
 
     @classmethod
     def get_result_set_class_instance(cls: Type[TEntity]) -> TResultSets:
         if cls.empty_item_comparison_attribute and cls.empty_item_comparison_value:
             return ResultSetWithEmptyItems(
                 cls.empty_item_comparison_attribute,
-                cls.empty_item_comparison_value
+                cls.empty_item_comparison_value,
+                cls.result_set_indexes,
             )
-        return ResultSet()
+        return ResultSet(cls.result_set_indexes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields present at json response, known ones first."""
+        result = {}
+        raw = self._raw
+        for name in self._fields:
+            try:
+                result[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                if raw and name in raw:
+                    result[name] = getattr(self, name)
+        if self._extra:
+            result.update(self._extra)
+        return result
 
     def __getstate__(self):
         # pickle
-        pickle = dict(self.__dict__)
-        return pickle
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        extra = {}
+        for k, v in state.items():
+            if k in self._fields:
+                setattr(self, k, v)
+            else:
+                extra[k] = v
+        if extra:
+            self._extra = extra
+
+    def __setattr__(self, name, value):
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            if hasattr(type(self), name):
+                # e.g. a read-only property
+                raise
+            # a field not known in advance, as it was before slots
+            extra = self._extra
+            if extra is None:
+                extra = {}
+                object.__setattr__(self, "_extra", extra)
+            extra[name] = value
 
     def __getattr__(self, name):
         """
         invoken when referring to attribute that it is not valid or it was not present at json response
         """
+        if name in Entity.__slots__:
+            return None
+        raw = self._raw
+        if raw is not None:
+            if name in raw:
+                return self._parse_lazy(name, raw)
+            try:
+                # parsed by another thread since the slot was looked up
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        extra = self._extra
+        if extra is not None:
+            return extra.get(name)
         return None
 
+    def _parse_lazy(self, name: str, raw: dict) -> Any:
+        """Parse a lazy field and memoize the result at its slot, once."""
+        with _LAZY_LOCK:
+            try:
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+            # only fields with an extra parser are kept raw
+            parser = (self.extra_parsers or {})[name]
+            intern = raw.get(_RAW_INTERN)
+            if intern is not None and isinstance(getattr(parser, "__self__", None), EntityMeta):
+                value = parser(raw[name], intern=intern)
+            else:
+                value = parser(raw[name])
+            # the slot is set before the raw json is dropped, see `__getattr__`
+            setattr(self, name, value)
+            del raw[name]
+            return value
+
+    @classmethod
+    def _compile_parser(cls: Type[TEntity], lazy: bool = False, interning: bool = False) -> Callable:
+        """
+        Build the parser of this entity once: straight-line code that copies
+        every known field into its slot, running the extra parser of the field
+        if any (or keeping its raw json at ``_raw`` when ``lazy``). Keys not
+        known in advance are collected at ``_extra``. With ``interning``, the
+        parser takes an ``intern`` function applied to every value and key.
+        """
+        extra_parsers = cls.extra_parsers or {}
+        # fields are set on an instance of a twin class with the default
+        # ``__setattr__``, much faster than ``Entity.__setattr__``, then the
+        # instance is turned into a ``cls`` one
+        builder = cls.__dict__.get("_builder")
+        if builder is None:
+            builder = EntityMeta(
+                f"{cls.__name__}Builder", (cls,), {"__slots__": (), "__setattr__": object.__setattr__}
+            )
+            cls._builder = builder
+        namespace: Dict[str, Any] = {
+            "new": object.__new__, "cls": cls, "builder": builder, "known": frozenset(cls._fields)
+        }
+        lines = [
+            "def parse(json, intern):" if interning else "def parse(json):",
+            "    instance = new(builder)",
+            "    found = 0",
+            "    raw = None",
+        ]
+        for index, name in enumerate(cls._fields):
+            lines.append(f"    if {name!r} in json:")
+            if name in extra_parsers and lazy:
+                lines.append("        if raw is None:")
+                if interning:
+                    # sections parsed later are interned too
+                    lines.append(f"            raw = instance._raw = {{{_RAW_INTERN!r}: intern}}")
+                else:
+                    lines.append("            raw = instance._raw = {}")
+                lines.append(f"        raw[{name!r}] = json[{name!r}]")
+            elif name in extra_parsers:
+                parser = namespace[f"parser_{index}"] = extra_parsers[name]
+                if interning and isinstance(getattr(parser, "__self__", None), EntityMeta):
+                    # nested entities share the intern function
+                    lines.append(f"        instance.{name} = parser_{index}(json[{name!r}], intern=intern)")
+                else:
+                    lines.append(f"        instance.{name} = parser_{index}(json[{name!r}])")
+            elif interning:
+                lines.append(f"        instance.{name} = intern(json[{name!r}])")
+            else:
+                lines.append(f"        instance.{name} = json[{name!r}]")
+            lines.append("        found += 1")
+        lines.append("    if found != len(json):")
+        if interning:
+            lines.append(
+                "        instance._extra = {intern(k): intern(v) for k, v in json.items() if k not in known}"
+            )
+        else:
+            lines.append("        instance._extra = {k: v for k, v in json.items() if k not in known}")
+        lines.append("    instance.__class__ = cls")
+        lines.append("    return instance")
+        exec("\n".join(lines), namespace)
+        parse = namespace["parse"]
+        setattr(cls, f"_compiled{'_lazy' if lazy else ''}{'_interning' if interning else ''}_parser", parse)
+        return parse
+
     @classmethod
-    def parse(cls: Type[TEntity], json: dict) -> Optional[TEntity]:
-        """Parse a JSON object into an entity instance."""
+    def _get_parser(cls: Type[TEntity], lazy: bool = False, interning: bool = False) -> Callable:
+        if interning:
+            parser = cls._compiled_lazy_interning_parser if lazy else cls._compiled_interning_parser
+        else:
+            parser = cls._compiled_lazy_parser if lazy else cls._compiled_parser
+        return parser or cls._compile_parser(lazy, interning)
+
+    @classmethod
+    def parse(
+        cls: Type[TEntity], json: dict, lazy: bool = False, intern: Optional[Callable[[Any], Any]] = None
+    ) -> Optional[TEntity]:
+        """
+        Parse a JSON object into an entity instance. With ``lazy``, nested
+        sections are parsed on first access instead of upfront. ``intern``
+        is applied to every value, e.g. an ``InternTable`` sharing repeated
+        strings, also when lazy sections are parsed.
+        """
         if not json:
             return None
-        instance = cls()
-        for k, v in json.items():
-            if cls.extra_parsers and k in cls.extra_parsers:
-                func = cls.extra_parsers[k]
-                setattr(instance, k, func(v))
-            else:
-                setattr(instance, k, v)
-        return instance
+        if intern is None:
+            return cls._get_parser(lazy)(json)
+        return cls._get_parser(lazy, interning=True)(json, intern)
 
     @classmethod
-    def parse_list(cls: Type[TEntity], json: dict) -> TResultSets:
+    def parse_list(
+        cls: Type[TEntity], json: dict, lazy: bool = False, intern: Optional[Callable[[Any], Any]] = None
+    ) -> TResultSets:
         results = cls.get_result_set_class_instance()
         items: Union[dict, list] = json or []
-        for obj in items:
-            results.append(cls.parse(obj))
-            results.total += 1
+        # the result set is new, no index to keep up to date
+        if intern is None:
+            parser = cls._get_parser(lazy)
+            list.extend(results, [parser(obj) if obj else None for obj in items])
+        else:
+            parser = cls._get_parser(lazy, interning=True)
+            list.extend(results, [parser(obj, intern) if obj else None for obj in items])
         # hold the count of items
-        # results.total = total
+        results.total = len(results)
         return results
 
+    @classmethod
+    def iter_parse_list(
+        cls: Type[TEntity],
+        json: Iterable[dict],
+        lazy: bool = False,
+        intern: Optional[Callable[[Any], Any]] = None,
+    ) -> Iterator[Optional[TEntity]]:
+        """
+        Parse the items of a JSON array one at a time, as they are consumed,
+        instead of building a result set holding all of them.
+        """
+        if intern is None:
+            parser = cls._get_parser(lazy)
+            for obj in json or []:
+                yield parser(obj) if obj else None
+        else:
+            parser = cls._get_parser(lazy, interning=True)
+            for obj in json or []:
+                yield parser(obj, intern) if obj else None
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert entities, and the result sets and dates within, into plain json values."""
+    if isinstance(value, Entity):
+        return {k: to_json_value(v) for k, v in value.to_dict().items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {k: to_json_value(v) for k, v in value.items()}
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
 
 class ElectionProcess(Entity):
+    fields = (
+        "idProcesoElectoral",
+        "strProcesoElectoral",
+        "strFechaAperturaProceso",
+        "strFechaConvocatoria",
+        "strFechaCierreProceso",
+        "strFechaRegistro",
+    )
     empty_item_comparison_attribute = "idProcesoElectoral"
     empty_item_comparison_value = 0
 
-    @property
+    @memoized_property
     def fechaAperturaProceso(self):
         return parse_date(self.strFechaAperturaProceso)
 
-    @property
+    @memoized_property
     def fechaConvocatoria(self):
         return parse_date(self.strFechaConvocatoria)
 
-    @property
+    @memoized_property
     def fechaCierreProceso(self):
         return parse_date(self.strFechaCierreProceso)
 
-    @property
+    @memoized_property
     def fechaRegistro(self):
         return parse_datetime(self.strFechaRegistro, format="%d/%m/%Y %H:%M:%S %p")
 
 
 class ElectionType(Entity):
-    pass
+    fields = ("idTipoEleccion", "strTipoEleccion")
 
 
 class ElectoralDistrict(Entity):
-    pass
+    fields = (
+        "strUbigeo",
+        "strDepartamento",
+    )
 
 
 class Candidate(Entity):
-
-    @property
+    fields = (
+        "idHojaVida",
+        "idOrganizacionPolitica",
+        "idProcesoElectoral",
+        "idSolicitudLista",
+        "idExpediente",
+        "idTipoEleccion",
+        "idCargoEleccion",
+        "idEstado",
+        "intPosicion",
+        "strCargo",
+        "strDocumentoIdentidad",
+        "strNombres",
+        "strApellidoPaterno",
+        "strApellidoMaterno",
+        "strSexo",
+        "strFechaNacimiento",
+        "strOrganizacionPolitica",
+        "strEstadoExp",
+        "strEstado",
+        "strUbigeo",
+        "strDepartamento",
+        "strProvincia",
+        "strDistrito",
+        "strGuid",
+    )
+    result_set_indexes = {"idHojaVida": True, "idOrganizacionPolitica": False}
+
+    @memoized_property
     def fechaNacimiento(self):
         return parse_datetime(self.strFechaNacimiento, format="%d/%m/%Y %H:%M:%S %p")
 
 
 class ProceduralPart(Entity):
-    pass
+    fields = (
+        "idParteProcesal",
+        "idExpediente",
+        "strTipoParte",
+        "strDocumentoIdentidad",
+        "strNombre",
+    )
 
 
 class Document(Entity):
-    pass
+    fields = (
+        "idDocumento",
+        "idExpediente",
+        "strTipoDocumento",
+        "strDocumento",
+        "strNombre",
+        "strDescripcion",
+        "strFecha",
+        "strUrl",
+    )
 
 
 class File(Entity):
-
+    fields = (
+        "idExpediente",
+        "idSolicitudLista",
+        "idOrganizacionPolitica",
+        "idProcesoElectoral",
+        "idTipoEleccion",
+        "idJuradoElectoral",
+        "idTipoExpediente",
+        "idEstado",
+        "strCodExpedienteExt",
+        "strOrganizacionPolitica",
+        "strTipoOrganizacion",
+        "strTipoEleccion",
+        "strJuradoElectoral",
+        "strTipoExpediente",
+        "strEstadoExpediente",
+        "strEstadoLista",
+        "strUbigeo",
+        "strDepartamento",
+        "strProvincia",
+        "strDistrito",
+        "strFechaPresentacion",
+        "strFechaRegistro",
+    )
+    result_set_indexes = {"idExpediente": True, "idOrganizacionPolitica": False}
     extra_parsers = {
         'lParteProcesal': ProceduralPart.parse_list
     }
@@ -142,19 +594,61 @@ class FileExtended(Entity):
 
 
 class MovableProperty(Entity):
-    pass
+    fields = (
+        "idHVBienMueble",
+        "idHojaVida",
+        "strTengoBienMueble",
+        "strVehiculo",
+        "strMarca",
+        "strModelo",
+        "strAnio",
+        "strPlaca",
+        "strCaracteristica",
+        "decValor",
+    )
 
 
 class ImmovableProperty(Entity):
+    fields = (
+        "idHVBienInmueble",
+        "idHojaVida",
+        "strTengoInmueble",
+        "strTipoBienInmueble",
+        "strInmuebleDireccion",
+        "strInmueblePais",
+        "strInmuebleDepartamento",
+        "strInmuebleProvincia",
+        "strInmuebleDistrito",
+        "strInmuebleSunarp",
+        "strPartidaSunarp",
+        "decAutovaluo",
+    )
     empty_item_comparison_attribute = "strTengoInmueble"
     empty_item_comparison_value = "2"
 
 
 class BasicEducation(Entity):
-    pass
+    fields = (
+        "idHVEduBasica",
+        "idHojaVida",
+        "strTengoEduBasica",
+        "strEduPrimaria",
+        "strConcluidoEduPrimaria",
+        "strEduSecundaria",
+        "strConcluidoEduSecundaria",
+    )
 
 
 class PartisanPosition(Entity):
+    fields = (
+        "idHVCargoPartidario",
+        "idHojaVida",
+        "strTengoCargoPartidario",
+        "strOrgPolCargoPartidario",
+        "strCargoPartidario",
+        "strAnioCargoPartiDesde",
+        "strAnioCargoPartiHasta",
+    )
     empty_item_comparison_attribute = "strTengoCargoPartidario"
     empty_item_comparison_value = "2"
 
@@ -176,6 +670,19 @@ class PartisanPosition(Entity):
 
 
 class UniversityEducation(Entity):
+    fields = (
+        "idHVEduUniversitaria",
+        "idHojaVida",
+        "strTengoEduUniversitaria",
+        "strUniversidad",
+        "strCarreraUni",
+        "strConcluidoEduUni",
+        "strEgresadoEduUni",
+        "strBachillerEduUni",
+        "strAnioBachiller",
+        "strTituloUni",
+        "strAnioTitulo",
+    )
 
     @property
     def anioBachiller(self):
@@ -187,6 +694,14 @@ class UniversityEducation(Entity):
 
 
 class NonUniversityEducation(Entity):
+    fields = (
+        "idHVNoUniversitaria",
+        "idHojaVida",
+        "strTengoNoUniversitaria",
+        "strCentroEstudioNoUni",
+        "strCarreraNoUni",
+        "strConcluidoNoUni",
+    )
 
     @property
     def tengoNoUniversitaria(self):
@@ -194,6 +709,18 @@ class NonUniversityEducation(Entity):
 
 
 class PostgraduateEducation(Entity):
+    fields = (
+        "idHVPosgrado",
+        "idHojaVida",
+        "strTengoPosgrado",
+        "strCenEstudioPosgrado",
+        "strEspecialidadPosgrado",
+        "strConcluidoPosgrado",
+        "strEgresadoPosgrado",
+        "strEsMaestro",
+        "strEsDoctor",
+        "strAnioPosgrado",
+    )
 
     @property
     def anioPosgrado(self):
@@ -205,6 +732,14 @@ class PostgraduateEducation(Entity):
 
 
 class TechnicalEducation(Entity):
+    fields = (
+        "idHVEduTecnico",
+        "idHojaVida",
+        "strTengoEduTecnico",
+        "strCenEstudioTecnico",
+        "strCarreraTecnico",
+        "strConcluidoEduTecnico",
+    )
 
     @property
     def tengoEduTecnico(self):
@@ -212,6 +747,21 @@ class TechnicalEducation(Entity):
 
 
 class ProfessionalExperience(Entity):
+    fields = (
+        "idHVExpeLaboral",
+        "idHojaVida",
+        "strTengoExpeLaboral",
+        "strCentroTrabajo",
+        "strOcupacionProfesion",
+        "strRucTrabajo",
+        "strDireccionTrabajo",
+        "strTrabajoPais",
+        "strTrabajoDepartamento",
+        "strTrabajoProvincia",
+        "strTrabajoDistrito",
+        "strAnioTrabajoDesde",
+        "strAnioTrabajoHasta",
+    )
     empty_item_comparison_attribute = "strTengoExpeLaboral"
     empty_item_comparison_value = "2"
 
@@ -236,39 +786,113 @@ class ProfessionalExperience(Entity):
 
 
 class ResignationPoliticalOrganization(Entity):
-    pass
+    fields = (
+        "idHVRenunciaOP",
+        "idHojaVida",
+        "strTengoRenunciaOP",
+        "strOrgPolRenunciaOP",
+        "strAnioRenunciaOP",
+    )
 
 
 class ObligationSentence(Entity):
+    fields = (
+        "idHVSentenciaObliga",
+        "idHojaVida",
+        "strTengoSentenciaObliga",
+        "strMateriaSentencia",
+        "strExpedienteObliga",
+        "strOrganoJuridicialObliga",
+        "strFalloObliga",
+    )
     empty_item_comparison_attribute = "strTengoSentenciaObliga"
     empty_item_comparison_value = "2"
 
 
 class PenalSentence(Entity):
+    fields = (
+        "idHVSentenciaPenal",
+        "idHojaVida",
+        "strTengoSentenciaPenal",
+        "strExpedientePenal",
+        "strFechaSentenciaPenal",
+        "strOrganoJudiPenal",
+        "strDelitoPenal",
+        "strFalloPenal",
+        "strModalidad",
+        "strOtraModalidad",
+        "strCumpleFallo",
+    )
     empty_item_comparison_attribute = "strTengoSentenciaPenal"
     empty_item_comparison_value = "2"
 
-    @property
+    @memoized_property
     def fechaSentenciaPenal(self):
         return parse_date(self.strFechaSentenciaPenal)
 
 
 class PersonalInfo(Entity):
-
-    @property
+    fields = (
+        "idHojaVida",
+        "idOrganizacionPolitica",
+        "idProcesoElectoral",
+        "strOrganizacionPolitica",
+        "strCargoEleccion",
+        "strDocumentoIdentidad",
+        "strCarneExtranjeria",
+        "strNombres",
+        "strApellidoPaterno",
+        "strApellidoMaterno",
+        "strSexo",
+        "strFechaNacimiento",
+        "strNaciPais",
+        "strNaciDepartamento",
+        "strNaciProvincia",
+        "strNaciDistrito",
+        "strUbigeoNacimiento",
+        "strDomiDepartamento",
+        "strDomiProvincia",
+        "strDomiDistrito",
+        "strDomicilioDirecc",
+        "strUbigeoResidencia",
+        "strPostulaDepartamento",
+        "strPostulaProvincia",
+        "strPostulaDistrito",
+        "strUbigeoPostula",
+        "strFeTerminoRegistro",
+        "strEstado",
+    )
+
+    @memoized_property
     def feTerminoRegistro(self):
         return parse_datetime(self.strFeTerminoRegistro)
 
-    @property
+    @memoized_property
     def fechaNacimiento(self):
         return parse_date(self.strFechaNacimiento)
 
 
 class AdditionalInformation(Entity):
-    pass
+    fields = (
+        "idHVInfoAdicional",
+        "idHojaVida",
+        "strTengoInfoAdicional",
+        "strInfoAdicional",
+    )
 
 
 class Income(Entity):
+    fields = (
+        "idHVIngresos",
+        "idHojaVida",
+        "strTengoIngresos",
+        "decRemuBrutaPublico",
+        "decRemuBrutaPrivado",
+        "decRentaIndividualPublico",
+        "decRentaIndividualPrivado",
+        "decOtroIngresoPublico",
+        "decOtroIngresoPrivado",
+    )
 
     @property
     def is_empty(self):
@@ -1,2 +1,6 @@
 class JNEException(Exception):
     pass
+
+
+class CircuitOpenError(JNEException):
+    pass
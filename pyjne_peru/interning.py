@@ -0,0 +1,114 @@
+import sys
+from typing import Any, Dict, Iterable, NamedTuple, Set
+
+from .entities import _RAW_INTERN, Entity
+
+
+class InternTable:
+    """
+    Table of shared strings, to be given as ``intern`` to ``Entity.parse``
+    or ``EntityParser``: every string value (and unknown key) of the parsed
+    entities equal to one already seen is replaced by the same object, so
+    that repeated party names, ubigeos, labels and statuses are stored once.
+
+    Strings longer than ``max_length`` (free text, unlikely to repeat) are
+    left alone. The table keeps its strings alive: use one per client or per
+    crawl and drop it, or ``clear`` it, afterwards.
+    """
+
+    def __init__(self, max_length: int = 256):
+        self.max_length = max_length
+        self.values: Dict[str, str] = {}
+
+    def __call__(self, value: Any) -> Any:
+        if value.__class__ is not str or len(value) > self.max_length:
+            return value
+        return self.values.setdefault(value, value)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the strings of the table, not counting the table itself."""
+        return sum(sys.getsizeof(value) for value in self.values)
+
+    def clear(self):
+        self.values.clear()
+
+
+class MemoryReport(NamedTuple):
+    # string references held by the entities
+    references: int
+    # distinct string objects and distinct string values among them
+    objects: int
+    values: int
+    # memory of the distinct objects, as held
+    nbytes: int
+    # memory if every reference had an object of its own, as parsed without interning
+    nbytes_unshared: int
+    # memory if every value was held once, as fully interned
+    nbytes_interned: int
+
+    @property
+    def saved(self) -> int:
+        """Bytes saved by shared strings."""
+        return self.nbytes_unshared - self.nbytes
+
+    def __str__(self):
+        return (
+            f"{self.references} string references, {self.objects} objects, {self.values} values: "
+            f"{self.nbytes} bytes held, {self.nbytes_unshared} unshared, {self.nbytes_interned} "
+            f"fully interned, {self.saved} saved"
+        )
+
+
+def memory_report(objects: Iterable[Any]) -> MemoryReport:
+    """
+    Measure the strings held by ``objects``: entities, result sets and the
+    json values within, including nested sections and raw lazy ones.
+    """
+    references = unshared = 0
+    seen: Dict[int, str] = {}
+    visited: Set[int] = set()
+    stack = list(objects)
+    while stack:
+        value = stack.pop()
+        if value.__class__ is str:
+            references += 1
+            unshared += sys.getsizeof(value)
+            seen[id(value)] = value
+        elif isinstance(value, Entity):
+            if id(value) in visited:
+                continue
+            visited.add(id(value))
+            for name in value._fields:
+                try:
+                    stack.append(object.__getattribute__(value, name))
+                except AttributeError:
+                    pass
+            try:
+                stack.append(object.__getattribute__(value, "_extra"))
+            except AttributeError:
+                pass
+            try:
+                raw = object.__getattribute__(value, "_raw")
+            except AttributeError:
+                raw = None
+            if raw:
+                stack.append({name: section for name, section in raw.items() if name != _RAW_INTERN})
+        elif isinstance(value, dict):
+            stack.extend(value)
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    sizes = {key: sys.getsizeof(string) for key, string in seen.items()}
+    distinct = {string: sizes[key] for key, string in seen.items()}
+    return MemoryReport(
+        references=references,
+        objects=len(seen),
+        values=len(distinct),
+        nbytes=sum(sizes.values()),
+        nbytes_unshared=unshared,
+        nbytes_interned=sum(distinct.values()),
+    )
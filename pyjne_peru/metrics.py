@@ -0,0 +1,125 @@
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+# upper bounds, in seconds, of the duration histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+TLabels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_label(path: str) -> str:
+    """'/HojaVida/GetHVConsolidado' -> 'GetHVConsolidado', '/Candidato/GetCandidatos/1-2' -> 'GetCandidatos'"""
+    parts = path.split("/")
+    return parts[2] if len(parts) > 2 else path
+
+
+class Histogram:
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Aggregate the events emitted by ``JNE`` into counters and histograms.
+    Register it as a hook with ``client.add_hook(metrics)`` and export it
+    with ``to_prometheus()``.
+
+    Request phases measured: ``wait`` (from sending the request to the
+    response headers, including DNS and connect when the connection is not
+    reused), ``download`` (reading the body), ``decode`` (json) and
+    ``parse`` (entities). Response sizes are counted as decompressed body
+    (``response_content_bytes_total``) and, when the server sends a
+    ``Content-Length``, as transferred (``response_wire_bytes_total``).
+    """
+
+    def __init__(self, namespace: str = "pyjne", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = buckets
+        self.counters: Dict[str, Dict[TLabels, float]] = defaultdict(lambda: defaultdict(float))
+        self.histograms: Dict[str, Dict[TLabels, Histogram]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def _inc(self, name: str, value: float = 1, **labels):
+        self.counters[name][tuple(sorted(labels.items()))] += value
+
+    def _observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        histogram = self.histograms[name].get(key)
+        if histogram is None:
+            histogram = self.histograms[name][key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def __call__(self, event: str, data: dict):
+        endpoint = data.get("endpoint", "")
+        with self._lock:
+            if event == "response":
+                self._inc("requests_total", endpoint=endpoint, status=str(data["status_code"]))
+                for size in ("content_bytes", "wire_bytes"):
+                    if data.get(size) is not None:
+                        self._inc(f"response_{size}_total", data[size], endpoint=endpoint)
+                self._observe("request_duration_seconds", data["elapsed"], endpoint=endpoint, phase="total")
+                for phase in ("wait", "download"):
+                    if data.get(phase) is not None:
+                        self._observe("request_duration_seconds", data[phase], endpoint=endpoint, phase=phase)
+            elif event in ("decode", "parse"):
+                self._observe("request_duration_seconds", data["elapsed"], endpoint=endpoint, phase=event)
+            elif event == "error":
+                self._inc("errors_total", endpoint=endpoint, error=type(data["error"]).__name__)
+            elif event == "retry":
+                self._inc("retries_total", endpoint=endpoint)
+            elif event == "cache":
+                self._inc("cache_hits_total" if data["hit"] else "cache_misses_total", endpoint=endpoint)
+            elif event == "snapshot":
+                name = "unchanged_responses_total" if data["unchanged"] else "changed_responses_total"
+                self._inc(name, endpoint=endpoint)
+            elif event == "coalesce":
+                self._inc("coalesced_requests_total", endpoint=endpoint)
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, counters in sorted(self.counters.items()):
+                full_name = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {full_name} counter")
+                for labels, value in sorted(counters.items()):
+                    lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+            for name, histograms in sorted(self.histograms.items()):
+                full_name = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {full_name} histogram")
+                for labels, histogram in sorted(histograms.items(), key=lambda item: item[0]):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(
+                            f"{full_name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}"
+                        )
+                    lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{full_name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: TLabels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
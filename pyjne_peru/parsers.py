@@ -1,30 +1,86 @@
-from typing import Optional, Union
+import codecs
+import importlib
+import json as stdlib_json
+from typing import Any, Callable, Iterable, Iterator, Optional, Type, Union
 
 from .entities import Entity, EntityFactory, ResultSet
 from .error import JNEException
 
 
 EntityParserResult = Union[Entity, ResultSet, None]
+# result of a list endpoint: an iterator of the entities when streamed
+EntityListResult = Union[EntityParserResult, Iterator[Optional[Entity]]]
+
+# json decoders tried in order when no backend is given
+JSON_BACKENDS = ("orjson", "ujson", "json")
+
+
+def get_json_loads(backend: Optional[str] = None) -> Callable[[bytes], Any]:
+    """
+    Return the ``loads`` function of ``backend`` or, when None, of the
+    fastest json library installed, falling back to the stdlib ``json``.
+    """
+    if backend is None:
+        for name in JSON_BACKENDS:
+            try:
+                return get_json_loads(name)
+            except JNEException:
+                continue
+    if backend == "json":
+        return stdlib_json.loads
+    try:
+        return importlib.import_module(backend).loads  # type: ignore
+    except ImportError:
+        raise JNEException(f'JSON backend not installed: {backend}')
 
 
 class EntityParser:
 
-    def __init__(self):
+    def __init__(
+        self,
+        lazy: bool = False,
+        json_backend: Optional[str] = None,
+        intern: Optional[Callable[[Any], Any]] = None,
+    ):
         self.entity_factory = EntityFactory
+        # parse nested sections (e.g. resume's lSentenciaPenal) on first access
+        self.lazy = lazy
+        # applied to every parsed value, e.g. an InternTable
+        self.intern = intern
+        self.json_loads = get_json_loads(json_backend)
 
-    def parse(
-        self, json: dict, payload_list: bool = False, payload_type: Optional[str] = None
-    ) -> EntityParserResult:
+    def decode(self, content: bytes) -> Any:
+        """Decode the raw body of a response."""
+        if content.startswith(codecs.BOM_UTF8):
+            content = content[len(codecs.BOM_UTF8):]
         try:
-            if payload_type is None:
-                return None
-            entity = getattr(self.entity_factory, payload_type)
+            return self.json_loads(content)
+        except ValueError as exc:
+            raise JNEException(f'Invalid JSON response: {exc}')
+
+    def get_entity(self, payload_type: str) -> Type[Entity]:
+        try:
+            return getattr(self.entity_factory, payload_type)
         except AttributeError:
             raise JNEException(f'No entity for this payload type: {payload_type}')
 
-        data = json.get('data')
+    def parse(
+        self, json: dict, payload_list: bool = False, payload_type: Optional[str] = None
+    ) -> EntityParserResult:
+        if payload_type is None:
+            return None
+        entity = self.get_entity(payload_type)
+
+        data: Any = json.get('data')
+        result: EntityParserResult
         if payload_list:
-            result = entity.parse_list(data)
+            result = entity.parse_list(data, lazy=self.lazy, intern=self.intern)
         else:
-            result = entity.parse(data)
+            result = entity.parse(data, lazy=self.lazy, intern=self.intern)
         return result
+
+    def iter_parse(self, items: Iterable[Any], payload_type: Optional[str] = None) -> Iterator[Optional[Entity]]:
+        """Parse a stream of json objects into entities, one at a time."""
+        if payload_type is None:
+            return
+        yield from self.get_entity(payload_type).iter_parse_list(items, lazy=self.lazy, intern=self.intern)
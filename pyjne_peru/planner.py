@@ -0,0 +1,102 @@
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .batch import run_batch
+from .entities import File, ResultSet
+from .error import JNEException
+
+# electoral districts not listed by ``JNE.get_electoral_districts``
+EXTRA_UBIGEOS = ("140101",)
+
+
+class FilesQuery(NamedTuple):
+    """Filters of ``JNE.get_files``, 0 (or "000000" for ubigeo) matches any value."""
+    jurado_electoral: int = 0
+    organizacion_politica: int = 0
+    proceso_electoral: int = 0
+    tipo_expediente: int = 0
+    ubigeo: str = "000000"
+
+
+class SweepResult(NamedTuple):
+    files: ResultSet
+    # partitions whose search failed, to sweep again
+    failed: List[Tuple[FilesQuery, BaseException]]
+
+
+class FilesSweep:
+    """
+    Splits a broad ``JNE.get_files`` search into partitions, one per value of
+    a filter left open, e.g. one per ubigeo or per jurado electoral, and
+    runs them on a thread pool. Files found by several partitions are kept
+    once, by ``idExpediente``. A failed partition is reported and does not
+    stop the sweep.
+
+    Ubigeos default to the electoral districts returned by the API (read
+    from their ``ubigeo_attribute``) plus ``EXTRA_UBIGEOS``. There is no
+    reference endpoint for the other filters, their values must be given.
+    """
+
+    def __init__(self, client, max_workers: int = 8, ubigeo_attribute: str = "strUbigeo"):
+        self.client = client
+        self.max_workers = max_workers
+        self.ubigeo_attribute = ubigeo_attribute
+
+    def ubigeos(self) -> List[str]:
+        districts = self.client.get_electoral_districts() or []
+        ubigeos = [getattr(district, self.ubigeo_attribute) for district in districts if district is not None]
+        ubigeos = [ubigeo for ubigeo in ubigeos if ubigeo]
+        return ubigeos + [ubigeo for ubigeo in EXTRA_UBIGEOS if ubigeo not in ubigeos]
+
+    def plan(
+        self, query: FilesQuery, by: str = "ubigeo", values: Optional[Iterable[Any]] = None
+    ) -> List[FilesQuery]:
+        """Partitions of ``query``, one per value of the filter ``by``."""
+        if by not in FilesQuery._fields:
+            raise JNEException(f'Unknown filter: {by}')
+        if getattr(query, by) != FilesQuery._field_defaults[by]:
+            raise JNEException(f'Cannot partition on a filter already set: {by}')
+        if values is None:
+            if by != "ubigeo":
+                raise JNEException(f'Values are required to partition on: {by}')
+            values = self.ubigeos()
+        changes: List[Dict[str, Any]] = [{by: value} for value in values]
+        return [query._replace(**change) for change in changes]
+
+    def iter_sweep(
+        self, partitions: Sequence[FilesQuery]
+    ) -> Iterator[Tuple[FilesQuery, Optional[ResultSet], Optional[BaseException]]]:
+        """Yield ``(partition, files, error)`` as partitions complete."""
+        def search(partition: FilesQuery) -> ResultSet:
+            return self.client.get_files(**partition._asdict())
+
+        keys = ((partition,) for partition in partitions)
+        for result in run_batch(search, keys, max_workers=self.max_workers, ordered=False):
+            yield result.key[0], result.result, result.error
+
+    def sweep(
+        self,
+        query: FilesQuery = FilesQuery(),
+        by: str = "ubigeo",
+        values: Optional[Iterable[Any]] = None,
+        partitions: Optional[Sequence[FilesQuery]] = None,
+    ) -> SweepResult:
+        """
+        Search the files matching ``query`` partitioned by ``by``, or the
+        given ``partitions`` (e.g. the failed ones of a previous sweep).
+        """
+        if partitions is None:
+            partitions = self.plan(query, by, values)
+        files = File.get_result_set_class_instance()
+        seen: Set[Any] = set()
+        failed = []
+        for partition, result, error in self.iter_sweep(partitions):
+            if error is not None:
+                failed.append((partition, error))
+                continue
+            for file in result or []:
+                if file is None or file.idExpediente in seen:
+                    continue
+                seen.add(file.idExpediente)
+                files.append(file)
+        files.total = len(files)
+        return SweepResult(files, failed)
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class RateLimiter:
+    """
+    Token bucket limiting requests per second and requests in flight.
+
+    The same instance can be shared by threads and by asyncio tasks: state
+    is kept under a ``threading.Lock`` and async callers poll it with
+    ``asyncio.sleep`` instead of blocking the event loop.
+
+    With ``adaptive=True`` the limits follow AIMD: every healthy response
+    (no error, latency under ``latency_target``) additively increases rate
+    and concurrency, an unhealthy one multiplicatively decreases them, at
+    most once per ``cooldown`` seconds.
+
+    ``clock`` returns the current time in seconds, ``time.monotonic`` by
+    default.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        concurrency: float = 10,
+        adaptive: bool = False,
+        min_rate: float = 1.0,
+        max_rate: float = 100.0,
+        min_concurrency: float = 1,
+        max_concurrency: float = 64,
+        latency_target: float = 2.0,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.clock = clock
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+        self._tokens = self._capacity
+        self._updated_at = clock()
+        self._decreased_at = 0.0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+    @property
+    def _capacity(self) -> float:
+        return self.burst if self.burst is not None else max(self.rate, 1.0)
+
+    def _try_acquire(self) -> float:
+        """Take a token and a concurrency slot, or return the seconds to wait."""
+        now = self.clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        if self.in_flight >= int(self.concurrency):
+            # woken up by release(), the timeout is only a safety net
+            return 0.05
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        self._tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def acquire(self):
+        with self._lock:
+            while True:
+                wait = self._try_acquire()
+                if not wait:
+                    return
+                self._released.wait(wait)
+
+    async def acquire_async(self):
+        while True:
+            with self._lock:
+                wait = self._try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, latency: float, ok: bool = True):
+        """Give back the concurrency slot and record the outcome of the request."""
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+            if self.adaptive:
+                if ok and latency <= self.latency_target:
+                    self._grow()
+                else:
+                    self._shrink()
+            self._released.notify_all()
+
+    def _grow(self):
+        # additive increase, spread over a window of requests as in TCP
+        self.rate = min(self.max_rate, self.rate + self.increase / max(self.rate, 1.0))
+        self.concurrency = min(
+            self.max_concurrency, self.concurrency + self.increase / max(self.concurrency, 1.0)
+        )
+
+    def _shrink(self):
+        now = self.clock()
+        if now - self._decreased_at < self.cooldown:
+            return
+        self._decreased_at = now
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.concurrency = max(self.min_concurrency, self.concurrency * self.decrease_factor)
+        self._tokens = min(self._tokens, self._capacity)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "concurrency": int(self.concurrency),
+                "in_flight": self.in_flight,
+                "successes": self.successes,
+                "failures": self.failures,
+            }
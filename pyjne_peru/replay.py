@@ -0,0 +1,297 @@
+"""
+Record responses of the JNE platform to disk and replay them, either
+in-process (``ReplayTransport``) or through a local HTTP stand-in server
+(``StandInServer``) that ``JNE.base_url`` can point to.
+
+Usage::
+
+    python -m pyjne_peru.replay record fixtures/ --proceso-electoral 110
+    python -m pyjne_peru.replay serve fixtures/ --port 8000 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from .error import JNEException
+
+
+def request_key(
+    method: str, path: str, params: Optional[dict] = None, data: Optional[dict] = None
+) -> str:
+    """Key of a request. Values are compared as strings, as sent over the wire."""
+    params = {k: str(v) for k, v in (params or {}).items()}
+    data = {k: str(v) for k, v in (data or {}).items()}
+    return json.dumps([method, path, params, data], sort_keys=True)
+
+
+class RecordedResponse:
+    """Minimal response compatible with the one returned by ``Transport``."""
+
+    def __init__(self, status_code: int, content: bytes, headers: Optional[dict] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class Cassette:
+    """Directory holding one json fixture per recorded request."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, dict] = {}
+        os.makedirs(path, exist_ok=True)
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".json"):
+                with open(os.path.join(path, name), encoding="utf-8") as fixture:
+                    entry = json.load(fixture)
+                self._entries[entry["key"]] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def save(self, key: str, request: dict, status_code: int, content: bytes):
+        entry = {
+            "key": key,
+            "request": request,
+            "status_code": status_code,
+            "body": content.decode("utf-8"),
+        }
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        with open(os.path.join(self.path, f"{name}.json"), "w", encoding="utf-8") as fixture:
+            json.dump(entry, fixture, ensure_ascii=False, indent=1)
+        self._entries[key] = entry
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._entries.get(key)
+
+
+class RecordingTransport:
+    """Wrap a transport and save every response it returns to a cassette."""
+
+    def __init__(self, transport, cassette: Cassette):
+        self.transport = transport
+        self.cassette = cassette
+
+    def request(self, method, url, params=None, data=None, stream=False):
+        response = self.transport.request(method, url, params=params, data=data)
+        path = urlsplit(url).path
+        self.cassette.save(
+            request_key(method, path, params, data),
+            {"method": method, "path": path, "params": params or {}, "data": data or {}},
+            response.status_code,
+            response.content,
+        )
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayTransport:
+    """Serve responses from a cassette without touching the network."""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def request(self, method, url, params=None, data=None, stream=False):
+        entry = self.cassette.get(request_key(method, urlsplit(url).path, params, data))
+        if entry is None:
+            return RecordedResponse(404, b"{}")
+        return RecordedResponse(entry["status_code"], entry["body"].encode("utf-8"))
+
+    def close(self):
+        pass
+
+
+class StandInServer:
+    """
+    Local HTTP server replaying a cassette.
+
+    ``latency`` seconds are added to every response, ``error_rate`` is the
+    probability of answering 503 instead, and ``payload_scale`` repeats the
+    ``data`` array of list responses to simulate bigger elections.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        payload_scale: int = 1,
+    ):
+        self.cassette = cassette
+        self.latency = latency
+        self.error_rate = error_rate
+        self.payload_scale = payload_scale
+        self._bodies: Dict[str, bytes] = {}
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}"
+
+    def _get_body(self, key: str) -> Optional[bytes]:
+        body = self._bodies.get(key)
+        if body is None:
+            entry = self.cassette.get(key)
+            if entry is None:
+                return None
+            body = entry["body"].encode("utf-8")
+            if self.payload_scale > 1:
+                payload = json.loads(body)
+                if isinstance(payload, dict) and isinstance(payload.get("data"), list):
+                    payload["data"] = payload["data"] * self.payload_scale
+                    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self._bodies[key] = body
+        return body
+
+    def _make_handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _reply(self, method):
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                form = self.rfile.read(length).decode("utf-8") if length else ""
+                key = request_key(method, url.path, dict(parse_qsl(url.query)), dict(parse_qsl(form)))
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                body = stand_in._get_body(key)
+                status = 200
+                if body is None:
+                    status, body = 404, b"{}"
+                elif stand_in.error_rate and random.random() < stand_in.error_rate:
+                    status, body = 503, b"{}"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply("GET")
+
+            def do_POST(self):
+                self._reply("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def record_endpoints(client, proceso_electoral: int):
+    """
+    Call every endpoint of ``client`` once, following the first election
+    type, file and candidate found for ``proceso_electoral``.
+    """
+    from .client import RESUME_SECTIONS
+
+    client.get_electoral_districts()
+    client.get_election_processes()
+    client.get_files(proceso_electoral=proceso_electoral)
+    election_types = client.get_election_types_by_process(proceso_electoral)
+    if not election_types:
+        raise JNEException(f"No election types for process {proceso_electoral}")
+    tipo_eleccion = election_types[0].idTipoEleccion
+    files = client.get_files_on_list(proceso_electoral, tipo_eleccion)
+    if not files:
+        return
+    file = files[0]
+    if file.strCodExpedienteExt:
+        client.get_file(file.strCodExpedienteExt)
+    candidates = client.get_candidates_by_list(
+        proceso_electoral, tipo_eleccion, file.idSolicitudLista, file.idExpediente
+    )
+    if not candidates:
+        return
+    candidate = candidates[0]
+    client.get_resume(candidate.idHojaVida, proceso_electoral, candidate.idOrganizacionPolitica)
+    client.get_resume_personal_info(candidate.idHojaVida, proceso_electoral, candidate.idOrganizacionPolitica)
+    for section in RESUME_SECTIONS:
+        getattr(client, f"get_resume_{section}")(candidate.idHojaVida)
+
+
+def main(argv=None):
+    from .client import JNE
+    from .transport import Transport
+
+    parser = argparse.ArgumentParser(prog="python -m pyjne_peru.replay")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record = subparsers.add_parser("record", help="record responses of the JNE platform")
+    record.add_argument("path")
+    record.add_argument("--proceso-electoral", type=int, required=True)
+    serve = subparsers.add_parser("serve", help="serve recorded responses")
+    serve.add_argument("path")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--payload-scale", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    cassette = Cassette(args.path)
+    if args.command == "record":
+        with JNE(transport=RecordingTransport(Transport(), cassette)) as client:
+            record_endpoints(client, args.proceso_electoral)
+        print(f"{len(cassette)} responses recorded at {args.path}")
+        return
+    server = StandInServer(
+        cassette,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        payload_scale=args.payload_scale,
+    )
+    print(f"Serving {len(cassette)} responses at {server.base_url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from .error import CircuitOpenError
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a request.
+
+    Only methods listed at ``idempotent_methods`` are retried. The delay
+    before the n-th retry is drawn uniformly from
+    ``[0, min(max_backoff, backoff_factor * 2 ** n)]`` ("full jitter"),
+    unless the response carries a ``Retry-After`` header.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+        retry_exceptions: Tuple[Type[BaseException], ...] = (OSError,),
+        idempotent_methods: Tuple[str, ...] = ("GET", "HEAD"),
+        respect_retry_after: bool = True,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.retry_exceptions = retry_exceptions
+        self.idempotent_methods = idempotent_methods
+        self.respect_retry_after = respect_retry_after
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        return attempt < self.max_retries and method in self.idempotent_methods
+
+    def get_backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and self.respect_retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# matched by path prefix. The POST search endpoints only read data, so
+# retrying them is safe.
+DEFAULT_RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    "/": RetryPolicy(),
+    "/Expediente/BusquedaReporteAvanzadoExpediente": RetryPolicy(idempotent_methods=("GET", "POST")),
+    "/Expediente/BuscandoCodigo": RetryPolicy(idempotent_methods=("GET", "POST")),
+}
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the JNE platform is down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests raise ``CircuitOpenError`` without being sent. Once
+    ``recovery_timeout`` seconds have passed, one trial request is let
+    through (half-open): its success closes the circuit, its failure opens
+    it again. ``clock`` returns the current time in seconds,
+    ``time.monotonic`` by default.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError("JNE circuit breaker is open")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = self.clock()
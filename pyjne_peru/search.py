@@ -0,0 +1,208 @@
+import bisect
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .entities import Candidate, PersonalInfo
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase ``text`` and drop its accents: 'Núñez' -> 'nunez'."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(fold(text))
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchHit(NamedTuple):
+    score: float
+    candidate: Candidate
+    personal_info: Optional[PersonalInfo] = None
+
+
+class CandidateSearchIndex:
+    """
+    In-memory search index of candidates by name.
+
+    Names are matched accent and case insensitively, word by word: exact
+    words rank first, then words starting with the query word, then
+    similar words (trigram similarity, to tolerate typos). Every query word
+    must match. Results can be filtered by any facet stored with the
+    candidate: by default party, position, electoral district (the ubigeo
+    and place the candidate runs for) and, when added from a crawl record,
+    election type.
+    """
+
+    name_fields = ("strNombres", "strApellidoPaterno", "strApellidoMaterno", "strCandidato")
+    facet_fields = (
+        "idOrganizacionPolitica",
+        "strOrganizacionPolitica",
+        "idTipoEleccion",
+        "idCargoEleccion",
+        "strCargo",
+        "strUbigeo",
+        "strDepartamento",
+        "strProvincia",
+        "strDistrito",
+        "strUbigeoPostula",
+        "strPostulaDepartamento",
+        "strPostulaProvincia",
+        "strPostulaDistrito",
+    )
+
+    def __init__(self, min_similarity: float = 0.4):
+        self.min_similarity = min_similarity
+        self._docs: Dict[Any, Tuple[Candidate, Optional[PersonalInfo], Dict[str, Any], Tuple[str, ...]]] = {}
+        self._postings: Dict[str, Set[Any]] = defaultdict(set)
+        self._sorted_tokens: List[str] = []
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._facets: Dict[Tuple[str, Any], Set[Any]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, candidate: Candidate, personal_info: Optional[PersonalInfo] = None, **facets):
+        """
+        Index ``candidate`` (and its ``personal_info`` if given) under its
+        ``idHojaVida``, replacing any previous version. ``facets`` are stored
+        along the facets read from the entities.
+        """
+        key = candidate.idHojaVida
+        names = " ".join(
+            str(value)
+            for entity in (candidate, personal_info) if entity is not None
+            for value in (getattr(entity, field) for field in self.name_fields) if value
+        )
+        all_facets = {
+            field: value
+            for entity in (personal_info, candidate) if entity is not None
+            for field, value in ((field, getattr(entity, field)) for field in self.facet_fields)
+            if value is not None
+        }
+        all_facets.update(facets)
+        tokens = tuple(dict.fromkeys(tokenize(names)))
+        with self._lock:
+            self._remove(key)
+            self._docs[key] = (candidate, personal_info, all_facets, tokens)
+            for facet in all_facets.items():
+                self._facets[facet].add(key)
+            for token in tokens:
+                postings = self._postings[token]
+                if not postings:
+                    bisect.insort(self._sorted_tokens, token)
+                    for trigram in trigrams(token):
+                        self._trigrams[trigram].add(token)
+                postings.add(key)
+
+    def add_many(self, candidates: Iterable[Candidate], **facets):
+        for candidate in candidates:
+            if candidate is not None:
+                self.add(candidate, **facets)
+
+    def add_records(self, records: Iterable, **facets):
+        """
+        Index the ``CandidateRecord`` yielded by a crawler, with the personal
+        info of their resume and the election process and type they were
+        found under.
+        """
+        for record in records:
+            resume = record.resume
+            context = {"idProcesoElectoral": record.proceso_electoral}
+            if record.election_type is not None:
+                context["idTipoEleccion"] = record.election_type.idTipoEleccion
+            context.update(facets)
+            self.add(record.candidate, resume.oDatosPersonales if resume is not None else None, **context)
+
+    def remove(self, id_hoja_vida: Any):
+        with self._lock:
+            self._remove(id_hoja_vida)
+
+    def _remove(self, key: Any):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for facet in doc[2].items():
+            self._facets[facet].discard(key)
+            if not self._facets[facet]:
+                del self._facets[facet]
+        for token in doc[3]:
+            postings = self._postings[token]
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+                del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+                for trigram in trigrams(token):
+                    tokens = self._trigrams[trigram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[trigram]
+
+    def _match_token(self, query_token: str) -> Dict[str, float]:
+        """Return the score of every indexed word matching ``query_token``."""
+        matches: Dict[str, float] = {}
+        sorted_tokens = self._sorted_tokens
+        for index in range(bisect.bisect_left(sorted_tokens, query_token), len(sorted_tokens)):
+            token = sorted_tokens[index]
+            if not token.startswith(query_token):
+                break
+            matches[token] = 1.0 if token == query_token else 0.75
+        if matches:
+            return matches
+        query_trigrams = trigrams(query_token)
+        shared = Counter(chain.from_iterable(self._trigrams.get(trigram, ()) for trigram in query_trigrams))
+        # similarity >= min_similarity requires at least this many shared trigrams
+        min_shared = self.min_similarity * len(query_trigrams)
+        for token, count in shared.items():
+            if count < min_shared:
+                continue
+            # a token of n characters has up to n + 1 trigrams, see `trigrams`
+            similarity = count / (len(query_trigrams) + len(token) + 1 - count)
+            if similarity >= self.min_similarity:
+                matches[token] = 0.5 * similarity
+        return matches
+
+    def search(self, query: str, limit: int = 10, **filters) -> List[SearchHit]:
+        """
+        Return up to ``limit`` candidates matching ``query``, best first.
+        ``filters`` keep only candidates whose facet equals the given value,
+        e.g. ``search("nunez", idOrganizacionPolitica=14)``.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        with self._lock:
+            all_matches = [self._match_token(query_token) for query_token in query_tokens]
+            key_sets = [
+                self._postings[next(iter(matches))] if len(matches) == 1
+                else set().union(*(self._postings[token] for token in matches))
+                for matches in all_matches
+            ]
+            key_sets.extend(self._facets.get((field, value), set()) for field, value in filters.items())
+            if not all(key_sets):
+                return []
+            key_sets.sort(key=len)
+            keys = key_sets[0].intersection(*key_sets[1:])
+            hits = []
+            for key in keys:
+                candidate, personal_info, _, tokens = self._docs[key]
+                score = sum(
+                    max(matches.get(token, 0.0) for token in tokens) for matches in all_matches
+                )
+                hits.append(SearchHit(score / len(query_tokens), candidate, personal_info))
+        # ties are sorted by id to keep results stable
+        hits.sort(key=lambda hit: (-hit.score, str(hit.candidate.idHojaVida)))
+        return hits[:limit]
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Any = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing a key into a single one.
+
+    While a call for a key is running, further calls for the same key wait
+    for it and get its result (or its exception) instead of running again.
+    Nothing is kept once the call completes, this is not a cache. Threads
+    use ``do`` and asyncio tasks ``do_async``; each keeps its own table of
+    calls in flight.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._in_flight_async: Dict[Hashable, asyncio.Future] = {}
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """Return ``func(*args, **kwargs)`` and whether it came from the call of another thread."""
+        with self._lock:
+            self.calls += 1
+            call = self._in_flight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._in_flight[key] = _Call()
+                leader = True
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: Hashable, func: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """Await ``func(*args, **kwargs)`` and tell whether it came from the call of another task."""
+        self.calls += 1
+        future = self._in_flight_async.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # shield it, a waiter being cancelled must not cancel the others
+            return await asyncio.shield(future), True
+        future = self._in_flight_async[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # retrieve it, so that an exception nobody waited for is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._in_flight_async[key]
+        return result, False
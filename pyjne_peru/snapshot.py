@@ -0,0 +1,227 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .entities import Entity, to_json_value
+from .error import JNEException
+
+
+def content_hash(content: bytes) -> str:
+    """Digest of a raw payload."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def value_hash(value: Any) -> str:
+    """Digest of an entity (or any json value), independent of the order of its keys."""
+    return content_hash(
+        json.dumps(to_json_value(value), sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+
+
+class ResponseSnapshots:
+    """
+    Hash of the last raw body of every request, with the result parsed
+    from it, so that an identical response is not decoded nor parsed again.
+    Beyond ``maxsize`` requests (unbounded if None), the least recently used
+    are dropped. Results are shared with every caller, treat them as read-only.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self.maxsize = maxsize
+        self.unchanged = 0
+        self.changed = 0
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+
+    def get(self, key: str, digest: str) -> Tuple[bool, Any]:
+        """Return whether the last body of ``key`` hashed to ``digest``, and its parsed result."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] != digest:
+                self.changed += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.unchanged += 1
+            return True, item[1]
+
+    def set(self, key: str, digest: str, result: Any):
+        with self._lock:
+            self._data[key] = (digest, result)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+def candidate_key(candidate: Entity) -> str:
+    return f"{candidate.idHojaVida}-{candidate.idOrganizacionPolitica}"
+
+
+# stage of ``Crawler`` or unit kind of ``ResumableCrawler`` -> what its failure leaves out
+FAILURE_SCOPES = {
+    "process": "process",
+    "files": "election_type",
+    "election_type": "election_type",
+    "candidates": "file",
+    "file": "file",
+    "resumes": "candidate",
+    "hoja_vida": "candidate",
+}
+
+
+class SnapshotDiff(NamedTuple):
+    # candidate keys are "idHojaVida-idOrganizacionPolitica"
+    new_candidates: Dict[str, dict]
+    withdrawn_candidates: Dict[str, dict]
+    changed_candidates: List[str]
+    # candidate key -> (previous, current) penal sentences
+    changed_penal_sentences: Dict[str, Tuple[list, list]]
+    # idExpediente -> documents not in the previous snapshot
+    new_documents: Dict[str, List[dict]]
+
+    @property
+    def empty(self) -> bool:
+        return not any(self)
+
+
+class CrawlSnapshot:
+    """
+    Content hashes of the candidates, resumes and file documents seen on a
+    crawl, with just enough of their data to report what changed between
+    two crawls. Snapshots are saved as json.
+
+    Units that failed during the crawl are recorded with ``add_failure``, so
+    that the candidates they would have produced are not reported as
+    withdrawn.
+    """
+
+    def __init__(self):
+        # candidate key -> {"candidate", "hash", "resume_hash", "penal_sentences", "penal_hash",
+        # "idTipoEleccion", "idExpediente"}
+        self.candidates: Dict[str, dict] = {}
+        # idExpediente -> document hash -> document
+        self.documents: Dict[str, Dict[str, dict]] = {}
+        # scope -> ids of the failed units, e.g. "file" -> idExpediente
+        self.failed: Dict[str, Set[str]] = {scope: set() for scope in FAILURE_SCOPES.values()}
+
+    def add_record(self, record) -> None:
+        """Add a ``CandidateRecord`` yielded by a crawler."""
+        candidate = record.candidate
+        entry = {"candidate": to_json_value(candidate), "hash": value_hash(candidate)}
+        if record.election_type is not None:
+            entry["idTipoEleccion"] = str(record.election_type.idTipoEleccion)
+        if record.file is not None:
+            entry["idExpediente"] = str(record.file.idExpediente)
+        if record.resume is not None:
+            penal_sentences = to_json_value(list(record.resume.lSentenciaPenal or []))
+            entry["resume_hash"] = value_hash(record.resume)
+            entry["penal_sentences"] = penal_sentences
+            entry["penal_hash"] = value_hash(penal_sentences)
+        self.candidates[candidate_key(candidate)] = entry
+
+    def add_records(self, records: Iterable) -> "CrawlSnapshot":
+        for record in records:
+            self.add_record(record)
+        return self
+
+    def add_file(self, file_extended: Entity) -> None:
+        """Add the documents of a file, as returned by ``JNE.get_file``."""
+        file = file_extended.oExpediente
+        if file is None:
+            return
+        documents = self.documents.setdefault(str(file.idExpediente), {})
+        for document in file_extended.lReporteBusquedaExpediente or []:
+            if document is not None:
+                documents[value_hash(document)] = to_json_value(document)
+
+    def add_failure(self, stage: str, key: Any, error: Optional[BaseException] = None) -> None:
+        """
+        Record a unit of the crawl that failed, to be given as ``on_error``
+        of ``Crawler`` or ``ResumableCrawler``. A unit retried successfully
+        afterwards stays recorded: candidates it produced are found anyway,
+        but none of its candidates is reported as withdrawn.
+        """
+        scope = FAILURE_SCOPES.get(stage)
+        if scope is None:
+            raise JNEException(f"Unknown crawl stage: {stage}")
+        if isinstance(key, str):
+            # a ResumableCrawler unit, e.g. "110-1-502-7" for a file
+            ids = key.split("-")
+            value = {
+                "process": ids[0], "election_type": ids[1], "file": ids[-1], "candidate": "-".join(ids[1:]),
+            }[scope]
+        elif scope == "election_type":
+            value = str(key[0].idTipoEleccion)
+        elif scope == "file":
+            value = str(key[1].idExpediente)
+        else:
+            value = candidate_key(key[2])
+        self.failed[scope].add(value)
+
+    def _missed(self, key: str, entry: dict) -> bool:
+        """Whether the candidate may be missing only because a unit of this crawl failed."""
+        failed = self.failed
+        return bool(
+            failed["process"]
+            or key in failed["candidate"]
+            or entry.get("idExpediente") in failed["file"]
+            or entry.get("idTipoEleccion") in failed["election_type"]
+        )
+
+    def diff(self, previous: "CrawlSnapshot") -> SnapshotDiff:
+        """
+        What changed from ``previous`` to this snapshot. Candidates missing
+        from a failed unit of this crawl are not reported as withdrawn.
+        """
+        current, before = self.candidates, previous.candidates
+        changed_penal_sentences = {}
+        for key in current.keys() & before.keys():
+            penal_hash = current[key].get("penal_hash")
+            if penal_hash is not None and penal_hash != before[key].get("penal_hash", penal_hash):
+                changed_penal_sentences[key] = (
+                    before[key]["penal_sentences"], current[key]["penal_sentences"]
+                )
+        new_documents = {}
+        for id_expediente, documents in self.documents.items():
+            seen = previous.documents.get(id_expediente, {})
+            added = [document for digest, document in documents.items() if digest not in seen]
+            if added:
+                new_documents[id_expediente] = added
+        return SnapshotDiff(
+            new_candidates={key: current[key]["candidate"] for key in current.keys() - before.keys()},
+            withdrawn_candidates={
+                key: before[key]["candidate"] for key in before.keys() - current.keys()
+                if not self._missed(key, before[key])
+            },
+            changed_candidates=sorted(
+                key for key in current.keys() & before.keys()
+                if (current[key]["hash"], current[key].get("resume_hash"))
+                != (before[key]["hash"], before[key].get("resume_hash"))
+            ),
+            changed_penal_sentences=changed_penal_sentences,
+            new_documents=new_documents,
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "candidates": self.candidates,
+                "documents": self.documents,
+                "failed": {scope: sorted(ids) for scope, ids in self.failed.items()},
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "CrawlSnapshot":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        snapshot = cls()
+        snapshot.candidates = data["candidates"]
+        snapshot.documents = data["documents"]
+        for scope, ids in data.get("failed", {}).items():
+            snapshot.failed[scope].update(ids)
+        return snapshot
@@ -0,0 +1,156 @@
+import codecs
+import json
+import queue
+import threading
+from typing import Any, Iterable, Iterator, Optional
+
+from .error import JNEException
+
+
+WHITESPACE = " \t\n\r"
+# marks the end of a prefetched iterable
+_END = object()
+
+
+class _Buffer:
+    """Text buffer filled on demand from an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Read one more chunk, return False when the stream is exhausted."""
+        if self.exhausted:
+            return False
+        if self.pos:
+            # drop the text already consumed
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self.chunks:
+            self.text += self.decoder.decode(chunk)
+            return True
+        self.text += self.decoder.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self) -> Optional[str]:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise JNEException(f"Invalid JSON stream: expected {char!r} at {self.pos}")
+        self.pos += 1
+
+    def decode_value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value, reading more chunks as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as exc:
+                if self.fill():
+                    continue
+                raise JNEException(f"Invalid JSON stream: {exc}")
+            if end == len(self.text) and not self.exhausted and self.text[self.pos] not in "{[\"":
+                # a number or literal may continue at the next chunk
+                if self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "data") -> Iterator[Any]:
+    """
+    Incrementally decode the array found at ``key`` of a top-level JSON
+    object, yielding its items one by one as the chunks arrive. Only the
+    item being decoded is kept in memory, not the whole document. Other keys
+    of the object are decoded and discarded; a ``null`` value at ``key``
+    yields nothing.
+    """
+    buffer = _Buffer(chunks)
+    decoder = json.JSONDecoder()
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        name = buffer.decode_value(decoder)
+        buffer.expect(":")
+        if name == key and buffer.peek() == "[":
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.decode_value(decoder)
+                    if buffer.peek() == ",":
+                        buffer.pos += 1
+                        continue
+                    buffer.expect("]")
+                    break
+        else:
+            buffer.decode_value(decoder)
+        if buffer.peek() == ",":
+            buffer.pos += 1
+            continue
+        buffer.expect("}")
+        return
+
+
+def prefetch(iterable: Iterable[Any], maxsize: int = 1000) -> Iterator[Any]:
+    """
+    Iterate ``iterable`` on a background thread, at most ``maxsize`` items
+    ahead of the consumer: fetching overlaps with consuming, and blocks when
+    the consumer falls behind. Exceptions raised by ``iterable`` are raised
+    to the consumer. Closing the returned generator stops the background
+    thread and closes ``iterable``.
+    """
+    items: queue.Queue = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((_END, None))
+        except BaseException as exc:
+            put((_END, exc))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,128 @@
+from typing import Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+TTimeout = Union[float, Tuple[Optional[float], Optional[float]], None]
+
+
+class Transport:
+    """
+    Pooled HTTP transport backed by a shared ``requests.Session``.
+
+    The session keeps connections alive between calls so consecutive requests
+    to the JNE platform reuse the same TCP+TLS connection. ``requests.Session``
+    with an ``HTTPAdapter`` is safe to share between threads for sending
+    requests; each thread checks out its own connection from the pool.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 30.0,
+        session: Optional[requests.Session] = None,
+    ):
+        self.timeout: TTimeout = (connect_timeout, read_timeout)
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        return self.session.request(
+            method, url, params=params or {}, data=data or {}, timeout=self.timeout, stream=stream
+        )
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class AsyncResponse:
+    """Body of an async response, read eagerly so the connection can be released."""
+
+    def __init__(self, status_code: int, content: bytes, headers: Optional[dict] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+class AsyncTransport:
+    """
+    Pooled asyncio HTTP transport backed by a shared ``aiohttp.ClientSession``.
+
+    ``aiohttp`` is an optional dependency, install it with
+    ``pip install python-jne-peru[async]``.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        connect_timeout: Optional[float] = 5.0,
+        read_timeout: Optional[float] = 30.0,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            import aiohttp
+
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout, sock_read=self.read_timeout
+                ),
+                headers={"Accept-Encoding": "gzip, deflate"},
+            )
+        return self.session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> AsyncResponse:
+        session = self._get_session()
+        async with session.request(method, url, params=params or {}, data=data or {}) as response:
+            return AsyncResponse(response.status, await response.read(), response.headers)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
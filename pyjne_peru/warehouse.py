@@ -0,0 +1,236 @@
+import json
+import re
+import sqlite3
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .entities import Candidate, ElectionProcess, ElectionType, Entity, File, Resume, to_json_value
+
+
+def _to_sql_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(to_json_value(value), ensure_ascii=False)
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+class Table:
+    """
+    SQLite table of an entity type: the ``context`` columns given at sync
+    time (e.g. the election process), one column per known field of the
+    entity and an ``extra`` json column with the fields not known in
+    advance. Nested sections are stored as json.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        entity: Type[Entity],
+        key: Sequence[str],
+        context: Sequence[str] = (),
+        indexes: Sequence[str] = (),
+    ):
+        self.name = name
+        self.entity = entity
+        self.key = tuple(key)
+        self.context = tuple(context)
+        self.fields = tuple(field for field in entity._fields if field not in self.context)
+        self.columns = self.context + self.fields + ("extra",)
+        self.indexes = tuple(indexes)
+
+    def create_statements(self) -> List[str]:
+        columns = ", ".join(f'"{column}"' for column in self.columns)
+        key = ", ".join(f'"{column}"' for column in self.key)
+        statements = [f'CREATE TABLE IF NOT EXISTS "{self.name}" ({columns}, PRIMARY KEY ({key}))']
+        for column in self.indexes:
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{self.name}_{column}" ON "{self.name}" ("{column}")'
+            )
+        return statements
+
+    def migrate_statements(self, existing: Iterable[str]) -> List[str]:
+        """
+        Add the columns missing from a table created by an older version,
+        e.g. for fields declared since. Their values of the rows already
+        stored stay in ``extra`` until the rows are synced again.
+        """
+        existing = set(existing)
+        return [
+            f'ALTER TABLE "{self.name}" ADD COLUMN "{column}"'
+            for column in self.columns if column not in existing
+        ]
+
+    def upsert_statement(self) -> str:
+        columns = ", ".join(f'"{column}"' for column in self.columns)
+        placeholders = ", ".join("?" for _ in self.columns)
+        key = ", ".join(f'"{column}"' for column in self.key)
+        updates = ", ".join(
+            f'"{column}" = excluded."{column}"' for column in self.columns if column not in self.key
+        )
+        return (
+            f'INSERT INTO "{self.name}" ({columns}) VALUES ({placeholders}) '
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}"
+        )
+
+    def row(self, entity: Entity, context: Dict[str, Any]) -> Tuple:
+        values = entity.to_dict()
+        row = [_to_sql_value(context.get(column, values.pop(column, None))) for column in self.context]
+        row.extend(_to_sql_value(values.pop(field, None)) for field in self.fields)
+        row.append(_to_sql_value(values) if values else None)
+        return tuple(row)
+
+
+def _section_tables() -> Dict[str, Table]:
+    """One table per nested section of ``Resume``, e.g. 'lSentenciaPenal' -> 'resume_penal_sentence'."""
+    tables = {}
+    for section, parser in (Resume.extra_parsers or {}).items():
+        entity = parser.__self__
+        is_list = parser.__func__ is vars(Entity)["parse_list"].__func__
+        context = ("idHojaVida", "position") if is_list else ("idHojaVida",)
+        name = "resume_" + _snake_case(entity.__name__)
+        tables[section] = Table(name, entity, key=context, context=context)
+    return tables
+
+
+class Warehouse:
+    """
+    Local SQLite copy of election data, written with batched transactional
+    upserts so a full election can be queried with SQL without refetching it
+    or holding it in memory.
+    """
+
+    def __init__(self, path: str = "pyjne_peru.sqlite", batch_size: int = 500):
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.tables: Dict[str, Table] = {
+            "election_process": Table(
+                "election_process", ElectionProcess, key=("idProcesoElectoral",)
+            ),
+            "election_type": Table(
+                "election_type", ElectionType, key=("idProcesoElectoral", "idTipoEleccion"),
+                context=("idProcesoElectoral",),
+            ),
+            "file": Table(
+                "file", File, key=("idExpediente",),
+                context=("idProcesoElectoral", "idTipoEleccion"),
+                indexes=("idProcesoElectoral", "idOrganizacionPolitica"),
+            ),
+            "candidate": Table(
+                "candidate", Candidate, key=("idProcesoElectoral", "idHojaVida", "idOrganizacionPolitica"),
+                context=("idProcesoElectoral", "idTipoEleccion", "idExpediente"),
+                indexes=("idHojaVida", "idExpediente", "idOrganizacionPolitica"),
+            ),
+        }
+        self.section_tables = _section_tables()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            for table in list(self.tables.values()) + list(self.section_tables.values()):
+                for statement in table.create_statements():
+                    self._conn.execute(statement)
+                existing = [row[1] for row in self._conn.execute(f'PRAGMA table_info("{table.name}")')]
+                for statement in table.migrate_statements(existing):
+                    self._conn.execute(statement)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _batches(self, items: Iterable) -> Iterator[list]:
+        items = iter(items)
+        while True:
+            batch = list(islice(items, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def upsert(self, table: Table, entities: Iterable[Optional[Entity]], **context) -> int:
+        """Upsert ``entities`` into ``table`` in transactions of ``batch_size`` rows."""
+        statement = table.upsert_statement()
+        count = 0
+        rows = (table.row(entity, context) for entity in entities if entity is not None)
+        for batch in self._batches(rows):
+            with self._lock, self._conn:
+                self._conn.executemany(statement, batch)
+            count += len(batch)
+        return count
+
+    def sync_election_processes(self, processes: Iterable[ElectionProcess]) -> int:
+        return self.upsert(self.tables["election_process"], processes)
+
+    def sync_election_types(self, election_types: Iterable[ElectionType], proceso_electoral: int) -> int:
+        return self.upsert(self.tables["election_type"], election_types, idProcesoElectoral=proceso_electoral)
+
+    def sync_files(self, files: Iterable[File], **context) -> int:
+        """``context`` may hold ``idProcesoElectoral`` and ``idTipoEleccion``."""
+        return self.upsert(self.tables["file"], files, **context)
+
+    def sync_candidates(self, candidates: Iterable[Candidate], **context) -> int:
+        """``context`` may hold ``idProcesoElectoral``, ``idTipoEleccion`` and ``idExpediente``."""
+        return self.upsert(self.tables["candidate"], candidates, **context)
+
+    def sync_resumes(self, resumes: Iterable[Tuple[int, Resume]]) -> int:
+        """
+        Store the sections of each ``(id_hoja_vida, resume)``, replacing the
+        previous version of the resume.
+        """
+        count = 0
+        statements = {section: table.upsert_statement() for section, table in self.section_tables.items()}
+        for batch in self._batches((key, resume) for key, resume in resumes if resume is not None):
+            rows: Dict[str, List[Tuple]] = {section: [] for section in self.section_tables}
+            for id_hoja_vida, resume in batch:
+                for section, table in self.section_tables.items():
+                    value = getattr(resume, section)
+                    if isinstance(value, list):
+                        rows[section].extend(
+                            table.row(item, {"idHojaVida": id_hoja_vida, "position": position})
+                            for position, item in enumerate(value) if item is not None
+                        )
+                    elif value is not None:
+                        rows[section].append(table.row(value, {"idHojaVida": id_hoja_vida}))
+            keys = [(id_hoja_vida,) for id_hoja_vida, _ in batch]
+            with self._lock, self._conn:
+                for section, table in self.section_tables.items():
+                    self._conn.executemany(f'DELETE FROM "{table.name}" WHERE "idHojaVida" = ?', keys)
+                    self._conn.executemany(statements[section], rows[section])
+            count += len(batch)
+        return count
+
+    def sync_records(self, records: Iterable) -> int:
+        """Store the ``CandidateRecord`` yielded by ``Crawler.crawl``."""
+        file_table, candidate_table = self.tables["file"], self.tables["candidate"]
+        file_statement, candidate_statement = file_table.upsert_statement(), candidate_table.upsert_statement()
+        count = 0
+        for batch in self._batches(records):
+            file_rows, candidate_rows = [], []
+            for record in batch:
+                context = {
+                    "idProcesoElectoral": record.proceso_electoral,
+                    "idTipoEleccion": record.election_type.idTipoEleccion,
+                    "idExpediente": record.file.idExpediente,
+                }
+                file_rows.append(file_table.row(record.file, context))
+                candidate_rows.append(candidate_table.row(record.candidate, context))
+            with self._lock, self._conn:
+                self._conn.executemany(file_statement, file_rows)
+                self._conn.executemany(candidate_statement, candidate_rows)
+            self.sync_resumes(
+                (record.candidate.idHojaVida, record.resume) for record in batch if record.resume is not None
+            )
+            count += len(batch)
+        return count
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            cursor.row_factory = sqlite3.Row
+            return cursor.fetchall()
@@ -0,0 +1,191 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class Task(NamedTuple):
+    id: int
+    kind: str
+    key: str
+    payload: Any
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Durable queue of work units kept in a SQLite database.
+
+    Units are identified by ``(kind, key)``: putting a unit already known,
+    whatever its state, is a no-op, so a restarted producer does not redo
+    finished work. ``lease`` hands out pending units to an ``owner`` for
+    ``lease_timeout`` seconds; units whose lease expired (e.g. their worker
+    crashed) are handed out again. A failed unit goes back to pending until
+    it was attempted ``max_attempts`` times, then it stays failed.
+
+    Several threads, processes or machines (on storage with working file
+    locks) can share the same database, leasing is done in a write
+    transaction so a unit is never handed to two owners at the same time.
+    """
+
+    def __init__(
+        self,
+        path: str = "pyjne_peru_queue.sqlite",
+        lease_timeout: float = 300,
+        max_attempts: int = 3,
+        owner: Optional[str] = None,
+    ):
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # autocommit, transactions are opened explicitly
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, key TEXT NOT NULL, "
+            "payload TEXT, priority INTEGER NOT NULL DEFAULT 0, "
+            "state TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            "owner TEXT, lease_expires REAL, error TEXT, updated REAL, "
+            "UNIQUE (kind, key))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, priority, id)"
+        )
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _transaction(self, statements: Iterable[Tuple[str, tuple]]) -> List[int]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                counts = [self._conn.execute(sql, params).rowcount for sql, params in statements]
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return counts
+
+    @staticmethod
+    def _put_statement(kind: str, key: str, payload: Any = None, priority: int = 0) -> Tuple[str, tuple]:
+        return (
+            "INSERT OR IGNORE INTO tasks (kind, key, payload, priority, updated) VALUES (?, ?, ?, ?, ?)",
+            (kind, key, json.dumps(payload, ensure_ascii=False), priority, time.time()),
+        )
+
+    def put(self, kind: str, key: str, payload: Any = None, priority: int = 0) -> bool:
+        """Add a unit, return whether it was not known yet. Higher ``priority`` units are leased first."""
+        return self._transaction([self._put_statement(kind, key, payload, priority)])[0] > 0
+
+    def put_many(self, kind: str, items: Iterable[Tuple[str, Any]], priority: int = 0) -> int:
+        """Add ``(key, payload)`` units in one transaction, return how many were new."""
+        return sum(self._transaction(
+            self._put_statement(kind, key, payload, priority) for key, payload in items
+        ))
+
+    def lease(self, limit: int = 1, kind: Optional[str] = None) -> List[Task]:
+        """Hand out up to ``limit`` pending or expired units, highest priority first."""
+        now = time.time()
+        sql = (
+            "SELECT id, kind, key, payload, attempts FROM tasks "
+            "WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))"
+        )
+        params: tuple = (now,)
+        if kind is not None:
+            sql += " AND kind = ?"
+            params += (kind,)
+        sql += " ORDER BY priority DESC, id LIMIT ?"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(sql, params + (limit,)).fetchall()
+                self._conn.executemany(
+                    "UPDATE tasks SET state = 'leased', owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    [(self.owner, now + self.lease_timeout, now, row[0]) for row in rows],
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return [
+            Task(id_, kind_, key, json.loads(payload), attempts + 1)
+            for id_, kind_, key, payload, attempts in rows
+        ]
+
+    def complete(self, task: Task, children: Iterable[Tuple[str, str, Any, int]] = ()):
+        """
+        Mark ``task`` as done, adding in the same transaction the
+        ``(kind, key, payload, priority)`` units it produced.
+        """
+        statements = [self._put_statement(*child) for child in children]
+        statements.append((
+            "UPDATE tasks SET state = 'done', owner = NULL, lease_expires = NULL, "
+            "error = NULL, updated = ? WHERE id = ?",
+            (time.time(), task.id),
+        ))
+        self._transaction(statements)
+
+    def fail(self, task: Task, error: BaseException):
+        """Record an error, the unit is retried unless it ran out of attempts."""
+        state = FAILED if task.attempts >= self.max_attempts else PENDING
+        self._transaction([(
+            "UPDATE tasks SET state = ?, owner = NULL, lease_expires = NULL, error = ?, "
+            "updated = ? WHERE id = ?",
+            (state, f"{type(error).__name__}: {error}", time.time(), task.id),
+        )])
+
+    def release(self, task: Task):
+        """Give back a leased unit not processed, without counting the attempt."""
+        self._transaction([(
+            "UPDATE tasks SET state = 'pending', owner = NULL, lease_expires = NULL, "
+            "attempts = attempts - 1, updated = ? WHERE id = ? AND state = 'leased' AND owner = ?",
+            (time.time(), task.id, self.owner),
+        )])
+
+    def retry_failed(self, kind: Optional[str] = None) -> int:
+        """Send failed units back to pending with their attempts reset."""
+        sql = "UPDATE tasks SET state = 'pending', attempts = 0, updated = ? WHERE state = 'failed'"
+        params: tuple = (time.time(),)
+        if kind is not None:
+            sql += " AND kind = ?"
+            params += (kind,)
+        return self._transaction([(sql, params)])[0]
+
+    def counts(self, kind: Optional[str] = None) -> Dict[str, int]:
+        """Number of units per state."""
+        result = dict.fromkeys((PENDING, LEASED, DONE, FAILED), 0)
+        sql = "SELECT state, COUNT(*) FROM tasks"
+        params: tuple = ()
+        if kind is not None:
+            sql, params = sql + " WHERE kind = ?", (kind,)
+        with self._lock:
+            result.update(self._conn.execute(sql + " GROUP BY state", params).fetchall())
+        return result
+
+    def failures(self, kind: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """``(kind, key, error)`` of the units that ran out of attempts."""
+        sql = "SELECT kind, key, error FROM tasks WHERE state = 'failed'"
+        params: tuple = ()
+        if kind is not None:
+            sql, params = sql + " AND kind = ?", (kind,)
+        with self._lock:
+            return self._conn.execute(sql + " ORDER BY id", params).fetchall()
@@ -13,17 +13,17 @@ with open('HISTORY.rst') as history_file:
 setup(
     author="Reiner Marquez",
     author_email='rmaceissoft@gmail.com',
-    python_requires='>=3.5',
+    python_requires='>=3.8',
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
         'Natural Language :: English',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
-        'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
     description="Librería de python para facilitar el acceso a la información pública "
                 "relativa a los procesos electorales de la plataforma del "
@@ -31,6 +31,10 @@ setup(
     install_requires=[
         'requests'
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'speedups': ['orjson'],
+    },
     license="GNU General Public License v3",
     long_description=readme + '\n\n' + history,
     include_package_data=True,
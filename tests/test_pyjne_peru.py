@@ -3,9 +3,124 @@
 """Tests for `pyjne_peru` package."""
 
 
+import asyncio
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
 import unittest
+from datetime import date, datetime
 
-from pyjne_peru.client import JNE
+from pyjne_peru.async_client import AsyncJNE
+from pyjne_peru.batch import run_batch, run_batch_async
+from pyjne_peru.cache import MemoryCache, SQLiteCache, TieredCache
+from pyjne_peru.client import JNE, RESUME_SECTIONS
+from pyjne_peru.crawler import CandidateRecord, Crawler, ResumableCrawler
+from pyjne_peru.entities import (
+    Candidate, ElectionType, File, FileExtended, PenalSentence, PersonalInfo, Resume, to_json_value
+)
+from pyjne_peru.interning import InternTable, memory_report
+from pyjne_peru.metrics import Metrics
+from pyjne_peru.parsers import EntityParser
+from pyjne_peru.planner import FilesQuery, FilesSweep
+from pyjne_peru.ratelimit import RateLimiter
+from pyjne_peru.replay import Cassette, RecordingTransport, ReplayTransport, StandInServer, record_endpoints
+from pyjne_peru.retry import CircuitBreaker, RetryPolicy
+from pyjne_peru.search import CandidateSearchIndex
+from pyjne_peru.singleflight import SingleFlight
+from pyjne_peru.snapshot import CrawlSnapshot, ResponseSnapshots
+from pyjne_peru.streaming import iter_json_array, prefetch
+from pyjne_peru.warehouse import Warehouse
+from pyjne_peru.utils import FAST_FORMATS, _parse_fixed_datetime, _strptime, parse_date, parse_datetime
+from pyjne_peru.workqueue import WorkQueue
+from pyjne_peru.error import CircuitOpenError, JNEException
+
+
+class FakeResponse:
+
+    def __init__(self, payload, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    @property
+    def content(self):
+        return json.dumps(self.payload).encode()
+
+    def iter_content(self, chunk_size=1):
+        content = json.dumps(self.payload).encode()
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeTransport:
+    """Local stand-in that records requests and replays canned payloads."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def request(self, method, url, params=None, data=None, stream=False):
+        self.calls.append((method, url, params, data))
+        path = url.split(".gob.pe", 1)[-1]
+        response = self.responses[path]
+        if isinstance(response, list):
+            # one response per call
+            response = response.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self):
+        pass
+
+
+class FakeAsyncTransport(FakeTransport):
+
+    async def request(self, method, url, params=None, data=None):
+        return super().request(method, url, params=params, data=data)
+
+    async def close(self):
+        pass
+
+
+class FakeClock:
+    """Clock of rate limiters and circuit breakers, moved by hand or by ``step`` per reading."""
+
+    def __init__(self, step=0.0):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class NotifyingLock:
+    """Lock waking up ``wait_for`` callers every time it is released."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+        self.condition.acquire()
+
+    def __exit__(self, *args):
+        self.condition.notify_all()
+        self.condition.release()
+
+    def wait_for(self, predicate):
+        with self.condition:
+            return self.condition.wait_for(predicate, timeout=5)
 
 
 class TestPyjne_peru(unittest.TestCase):
@@ -17,5 +132,914 @@ class TestPyjne_peru(unittest.TestCase):
     def tearDown(self):
         """Tear down test fixtures, if any."""
 
-    def test_000_something(self):
-        """Test something."""
+    def test_injected_transport(self):
+        transport = FakeTransport({
+            "/Resoluciones/GetListProcesosCR": FakeResponse(
+                {"data": [{"idProcesoElectoral": 110}, {"idProcesoElectoral": 0}]}
+            ),
+        })
+        client = JNE(transport=transport)
+        result = client.get_election_processes()
+        self.assertEqual(result.total, 2)
+        self.assertEqual(transport.calls[0][0], "GET")
+
+    def test_error_status_code(self):
+        transport = FakeTransport({
+            "/Expediente/BuscandoCodigo": FakeResponse({}, status_code=500),
+        })
+        client = JNE(transport=transport, retry_policies={})
+        with self.assertRaises(JNEException):
+            client.get_file("ABC")
+
+    def test_async_client(self):
+        responses = {
+            "/HojaVida/GetHVConsolidado": FakeResponse(
+                {"data": {"oDatosPersonales": {"strNombres": "ANA"}, "lSentenciaPenal": []}}
+            ),
+        }
+
+        async def fetch():
+            async with AsyncJNE(transport=FakeAsyncTransport(responses), max_concurrency=2) as client:
+                return await asyncio.gather(*[client.get_resume(i, 110, 1) for i in range(5)])
+
+        resumes = asyncio.run(fetch())
+        self.assertEqual(len(resumes), 5)
+        self.assertEqual(resumes[0].oDatosPersonales.strNombres, "ANA")
+
+        async def stream():
+            async with AsyncJNE(transport=FakeAsyncTransport(responses)) as client:
+                return await client.get_resume_penal_sentence(1, stream=True)
+
+        with self.assertRaisesRegex(TypeError, "GetAllHVSentenciaPenal"):
+            asyncio.run(stream())
+
+    def test_async_get_resumes(self):
+        ok = FakeResponse({"data": {"oDatosPersonales": {"strNombres": "ANA"}}})
+
+        async def fetch(ordered):
+            # the third resume fails
+            transport = FakeAsyncTransport({"/HojaVida/GetHVConsolidado": [ok, ok, FakeResponse({}, 404)] + [ok] * 7})
+            async with AsyncJNE(transport=transport, retry_policies={}) as client:
+                return [result async for result in client.get_resumes(
+                    ((i, 110, 1) for i in range(10)), max_workers=3, ordered=ordered
+                )]
+
+        results = asyncio.run(fetch(True))
+        self.assertEqual([result.key[0] for result in results], list(range(10)))
+        self.assertEqual(results[0].result.oDatosPersonales.strNombres, "ANA")
+        self.assertEqual([result.key[0] for result in results if not result.ok], [2])
+        self.assertIsInstance(results[2].error, JNEException)
+        self.assertEqual(len(asyncio.run(fetch(False))), 10)
+
+    def test_get_resumes_reports_failures(self):
+        client = JNE(transport=FakeTransport({}))
+
+        def get_resume(id_hoja_vida, proceso_electoral, id_organizacion_poitica):
+            if id_hoja_vida == 3:
+                raise JNEException("boom")
+            return id_hoja_vida
+
+        client.get_resume = get_resume
+        keys = ((i, 110, 1) for i in range(20))
+        results = list(client.get_resumes(keys, max_workers=4))
+        self.assertEqual([r.result for r in results if r.ok], [i for i in range(20) if i != 3])
+        self.assertIsInstance(results[3].error, JNEException)
+
+        results = list(client.get_resumes(((i, 110, 1) for i in range(20)), ordered=False))
+        self.assertEqual(len(results), 20)
+
+    def test_resume_sections(self):
+        responses = {
+            "/HojaVida/GetAllHVSentenciaPenal": FakeResponse({"data": [{"strExpedientePenal": "1-2020"}]}),
+            "/HojaVida/GetAllHVEduBasica": FakeResponse({"data": [{"strEduPrimaria": "1"}]}),
+            "/HojaVida/GetAllHVBienMueble": [FakeResponse({"data": []}), FakeResponse({}, 500)],
+        }
+        client = JNE(transport=FakeTransport(responses), retry_policies={})
+        resume = client.get_resume_sections(7, ["penal_sentence", "basic_education", "movable_property"])
+        self.assertIsInstance(resume, Resume)
+        self.assertEqual(resume.lSentenciaPenal[0].strExpedientePenal, "1-2020")
+        self.assertEqual(resume.oEduBasica.strEduPrimaria, "1")
+        self.assertEqual(len(resume.lBienMueble), 0)
+        self.assertIsNone(resume.lSentenciaObliga)
+
+        results = list(client.get_resumes_sections([8], ["penal_sentence", "movable_property"]))
+        self.assertIsInstance(results[0].error, JNEException)
+        with self.assertRaises(JNEException):
+            client.get_resume_sections(7, ["unknown"])
+        self.assertIsNone(client.get_resume_sections(7, []).lSentenciaPenal)
+
+    def test_async_resume_sections(self):
+        async def fetch():
+            transport = FakeAsyncTransport({
+                "/HojaVida/GetAllHVSentenciaPenal": FakeResponse({"data": [{"strExpedientePenal": "1-2020"}]}),
+                # the second resume fails
+                "/HojaVida/GetAllHVEduBasica": [
+                    FakeResponse({"data": [{"strEduPrimaria": "1"}]}), FakeResponse({}, 500),
+                    FakeResponse({"data": [{"strEduPrimaria": "1"}]}),
+                ],
+            })
+            async with AsyncJNE(transport=transport, retry_policies={}) as client:
+                return [result async for result in client.get_resumes_sections(
+                    [7, 8, 9], ["penal_sentence", "basic_education"], max_workers=1
+                )]
+
+        results = asyncio.run(fetch())
+        self.assertEqual([result.key for result in results], [7, 8, 9])
+        self.assertEqual(results[0].result.lSentenciaPenal[0].strExpedientePenal, "1-2020")
+        self.assertEqual(results[2].result.oEduBasica.strEduPrimaria, "1")
+        self.assertIsInstance(results[1].error, JNEException)
+
+    def test_single_flight(self):
+        release = threading.Event()
+
+        class SlowTransport(FakeTransport):
+            def request(self, *args, **kwargs):
+                release.wait(5)
+                return super().request(*args, **kwargs)
+
+        transport = SlowTransport({
+            "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+        })
+        single_flight = SingleFlight()
+        single_flight._lock = lock = NotifyingLock()
+        client = JNE(transport=transport, single_flight=single_flight)
+        events = []
+        client.add_hook(lambda event, data: events.append(event))
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get_election_types_by_process(110)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        # every thread joined the call in flight before it completes
+        self.assertTrue(lock.wait_for(lambda: single_flight.calls == 8))
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(transport.calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(events.count("coalesce"), 7)
+
+        async def fetch():
+            released = asyncio.Event()
+
+            class SlowAsyncTransport(FakeAsyncTransport):
+                async def request(self, *args, **kwargs):
+                    await released.wait()
+                    return await super().request(*args, **kwargs)
+
+            async with AsyncJNE(transport=SlowAsyncTransport({
+                "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            }), single_flight=SingleFlight()) as client:
+                gathered = asyncio.gather(*[client.get_election_types_by_process(110) for _ in range(5)])
+                while client.single_flight.calls < 5:
+                    await asyncio.sleep(0)  # let the tasks reach the call in flight
+                released.set()
+                return client, await gathered
+
+        client, results = asyncio.run(fetch())
+        self.assertEqual(len(client.transport.calls), 1)
+        self.assertEqual(client.single_flight.coalesced, 4)
+
+    def test_crawler(self):
+        transport = FakeTransport({
+            "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse(
+                {"data": [{"idTipoEleccion": 1}, {"idTipoEleccion": 2}]}
+            ),
+            "/Candidato/GetExpedientesLista/110-1-null------0-": FakeResponse(
+                {"data": [{"idSolicitudLista": 5, "idExpediente": 7}]}
+            ),
+            "/Candidato/GetExpedientesLista/110-2-null------0-": FakeResponse(
+                {"data": [{"idSolicitudLista": 6, "idExpediente": 8}]}
+            ),
+            "/Candidato/GetCandidatos/1-110-5-7": FakeResponse(
+                {"data": [{"idHojaVida": 1, "idOrganizacionPolitica": 9},
+                          {"idHojaVida": 2, "idOrganizacionPolitica": 9}]}
+            ),
+            "/Candidato/GetCandidatos/2-110-6-8": FakeResponse(
+                {"data": [{"idHojaVida": 2, "idOrganizacionPolitica": 9}]}
+            ),
+            "/HojaVida/GetHVConsolidado": FakeResponse(
+                {"data": {"oDatosPersonales": {"strNombres": "ANA"}}}
+            ),
+        })
+        records = list(Crawler(JNE(transport=transport)).crawl(110))
+        self.assertEqual(sorted(r.candidate.idHojaVida for r in records), [1, 2])
+        self.assertEqual(records[0].resume.oDatosPersonales.strNombres, "ANA")
+
+    def test_run_batch(self):
+        pulled = []
+
+        def keys():
+            for key in range(10):
+                pulled.append(key)
+                yield key
+
+        # finished results are handed out before more keys are pulled
+        results = run_batch(lambda key: key * 2, keys(), max_workers=1)
+        self.assertEqual(next(results), (0, 0, None))
+        self.assertEqual(pulled, [0, 1])
+        self.assertEqual([result.result for result in results], [2 * key for key in range(1, 10)])
+
+        failing = list(run_batch(lambda key: 1 / key, [1, 0], ordered=False))
+        self.assertEqual(sorted(result.ok for result in failing), [False, True])
+
+        async def double(key):
+            return key * 2
+
+        async def collect():
+            pulled.clear()
+            results = run_batch_async(double, keys(), max_workers=2)
+            first = await results.__anext__()
+            self.assertEqual(pulled, [0, 1])
+            return [first] + [result async for result in results]
+
+        self.assertEqual([result.result for result in asyncio.run(collect())], [2 * key for key in range(10)])
+
+    def test_resumable_crawler(self):
+        transport = FakeTransport({
+            "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            "/Candidato/GetExpedientesLista/110-1-null------0-": FakeResponse(
+                {"data": [{"idSolicitudLista": 5, "idExpediente": 7}]}
+            ),
+            "/Candidato/GetCandidatos/1-110-5-7": FakeResponse(
+                {"data": [{"idHojaVida": i, "idOrganizacionPolitica": 9} for i in range(4)]}
+            ),
+            "/HojaVida/GetHVConsolidado": [FakeResponse({}, 500)] + [
+                FakeResponse({"data": {"oDatosPersonales": {"strNombres": "ANA"}}}) for _ in range(5)
+            ],
+        })
+        client = JNE(transport=transport, retry_policies={})
+        errors = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "queue.sqlite")
+            with WorkQueue(path) as queue:
+                crawl = ResumableCrawler(client, queue, workers=1, on_error=lambda *args: errors.append(args)).crawl(110)
+                next(crawl)
+                next(crawl)
+                crawl.close()
+                # the record being consumed when stopped is handed out again
+                self.assertEqual(queue.counts("hoja_vida"), {"pending": 3, "leased": 0, "done": 1, "failed": 0})
+
+            # restarted on the same queue, only the remaining units are fetched
+            with WorkQueue(path) as queue:
+                records = list(ResumableCrawler(client, queue, workers=2).crawl(110))
+                self.assertEqual(queue.counts(), {"pending": 0, "leased": 0, "done": 7, "failed": 0})
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0].resume.oDatosPersonales.strNombres, "ANA")
+        self.assertEqual(records[0].file.idExpediente, 7)
+        # the failed resume was retried, the consumed one was not fetched again
+        self.assertEqual(len(transport.calls), 3 + 1 + 2 + 3)
+
+    def test_work_queue_leases(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "queue.sqlite")
+            first = WorkQueue(path, lease_timeout=60, max_attempts=1)
+            second = WorkQueue(path, lease_timeout=60)
+            self.assertEqual(first.put_many("unit", [(str(i), {"i": i}) for i in range(3)]), 3)
+            self.assertFalse(first.put("unit", "0"))
+            leased = first.lease(2)
+            self.assertEqual([task.payload["i"] for task in leased], [0, 1])
+            self.assertEqual([task.key for task in second.lease(5)], ["2"])
+            self.assertEqual(second.lease(5), [])
+            first.fail(leased[0], JNEException("boom"))
+            self.assertEqual(first.failures(), [("unit", "0", "JNEException: boom")])
+            first.complete(leased[1], [("unit", "3", None, 0)])
+            self.assertEqual(first.counts(), {"pending": 1, "leased": 1, "done": 1, "failed": 1})
+            first.close()
+            second.close()
+
+    def test_response_snapshots(self):
+        transport = FakeTransport({"/Candidato/GetTipoEleccionbyProceso/110": [
+            FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            FakeResponse({"data": [{"idTipoEleccion": 2}]}),
+        ]})
+        client = JNE(transport=transport, snapshots=ResponseSnapshots())
+        first = client.get_election_types_by_process(110)
+        self.assertIs(client.get_election_types_by_process(110), first)
+        self.assertEqual(client.get_election_types_by_process(110)[0].idTipoEleccion, 2)
+        self.assertEqual((client.snapshots.unchanged, client.snapshots.changed), (1, 2))
+        snapshots = ResponseSnapshots(maxsize=1)
+        snapshots.set("a", "1", None)
+        snapshots.set("b", "2", None)
+        self.assertEqual((len(snapshots), snapshots.get("a", "1")[0]), (1, False))
+
+        # an unchanged response still refreshes the expired cache entry
+        response = FakeResponse({"data": [{"idTipoEleccion": 1}]})
+        transport = FakeTransport({"/Candidato/GetTipoEleccionbyProceso/110": [response, response]})
+        client = JNE(
+            transport=transport, snapshots=ResponseSnapshots(), cache=MemoryCache(),
+            cache_ttls={"/Candidato": 0.05},
+        )
+        first = client.get_election_types_by_process(110)
+        time.sleep(0.1)
+        self.assertIs(client.get_election_types_by_process(110), first)
+        self.assertEqual(client.get_election_types_by_process(110)[0].idTipoEleccion, 1)
+        self.assertEqual(len(transport.calls), 2)
+
+    def test_crawl_snapshot_diff(self):
+        def record(id_hoja_vida, sentences):
+            resume = Resume.parse({"lSentenciaPenal": sentences})
+            return CandidateRecord(
+                110, None, None, Candidate.parse({"idHojaVida": id_hoja_vida, "idOrganizacionPolitica": 9}), resume
+            )
+
+        def file(documents):
+            return FileExtended.parse({"oExpediente": {"idExpediente": 7}, "lReporteBusquedaExpediente": documents})
+
+        previous = CrawlSnapshot().add_records([record(1, []), record(2, [{"strExpedientePenal": "A"}])])
+        previous.add_file(file([{"strNombre": "solicitud.pdf"}]))
+        current = CrawlSnapshot().add_records([record(2, [{"strExpedientePenal": "B"}]), record(3, [])])
+        current.add_file(file([{"strNombre": "solicitud.pdf"}, {"strNombre": "resolucion.pdf"}]))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "snapshot.json")
+            previous.save(path)
+            previous = CrawlSnapshot.load(path)
+        diff = current.diff(previous)
+        self.assertEqual(list(diff.new_candidates), ["3-9"])
+        self.assertEqual(list(diff.withdrawn_candidates), ["1-9"])
+        self.assertEqual(diff.changed_candidates, ["2-9"])
+        self.assertEqual(diff.changed_penal_sentences["2-9"][1], [{"strExpedientePenal": "B"}])
+        self.assertEqual(diff.new_documents, {"7": [{"strNombre": "resolucion.pdf"}]})
+        self.assertTrue(current.diff(current).empty)
+
+        # candidates of a failed unit are not withdrawn
+        current.add_failure("resumes", (None, None, Candidate.parse({"idHojaVida": 1, "idOrganizacionPolitica": 9})))
+        self.assertEqual(current.diff(previous).withdrawn_candidates, {})
+        file = File.parse({"idExpediente": 5})
+        previous = CrawlSnapshot().add_records([
+            CandidateRecord(110, ElectionType.parse({"idTipoEleccion": 1}), file, Candidate.parse(
+                {"idHojaVida": i, "idOrganizacionPolitica": 9}
+            )) for i in (1, 2)
+        ])
+        current = CrawlSnapshot()
+        current.add_failure("file", "110-1-300-5", JNEException("timeout"))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "snapshot.json")
+            current.save(path)
+            current = CrawlSnapshot.load(path)
+        self.assertEqual(current.diff(previous).withdrawn_candidates, {})
+        self.assertEqual(sorted(CrawlSnapshot().diff(previous).withdrawn_candidates), ["1-9", "2-9"])
+
+    def test_files_sweep(self):
+        class SearchTransport(FakeTransport):
+            def request(self, method, url, params=None, data=None, stream=False):
+                if data is None:
+                    return super().request(method, url, params=params, data=data)
+                self.calls.append((method, url, params, data))
+                if data["strUbigeo"] == "020000":
+                    return FakeResponse({}, 500)
+                found = {"010000": [1, 2], "030000": [2, 3], "140101": [4]}[data["strUbigeo"]]
+                return FakeResponse({"data": [{"idExpediente": i} for i in found]})
+
+        transport = SearchTransport({"/Candidato/ListUbigeoDepartamento": FakeResponse(
+            {"data": [{"strUbigeo": "010000"}, {"strUbigeo": "020000"}, {"strUbigeo": "030000"}]}
+        )})
+        sweep = FilesSweep(JNE(transport=transport, retry_policies={}), max_workers=2)
+        result = sweep.sweep(FilesQuery(proceso_electoral=110))
+        self.assertEqual(sorted(file.idExpediente for file in result.files), [1, 2, 3, 4])
+        self.assertEqual(result.files.get_by("idExpediente", 3).idExpediente, 3)
+        self.assertEqual([partition.ubigeo for partition, _ in result.failed], ["020000"])
+        self.assertEqual(result.failed[0][0].proceso_electoral, 110)
+        self.assertEqual(len(sweep.plan(FilesQuery(), "jurado_electoral", [1, 2])), 2)
+        with self.assertRaises(JNEException):
+            sweep.plan(FilesQuery(ubigeo="010000"))
+        with self.assertRaises(JNEException):
+            sweep.plan(FilesQuery(), "jurado_electoral")
+
+    def test_cache(self):
+        transport = FakeTransport({
+            "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            "/Expediente/BuscandoCodigo": FakeResponse({"data": {"oExpediente": {"idExpediente": 1}}}),
+        })
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.sqlite")
+            cache = TieredCache(MemoryCache(maxsize=1), SQLiteCache(path))
+            client = JNE(transport=transport, cache=cache)
+            for _ in range(3):
+                self.assertEqual(client.get_election_types_by_process(110)[0].idTipoEleccion, 1)
+                client.get_file("ABC")
+            # POST search endpoints are not cached by default
+            self.assertEqual(len(transport.calls), 4)
+            self.assertEqual(cache.stats.hits, 2)
+
+            persistent = SQLiteCache(path)
+            client = JNE(transport=transport, cache=persistent)
+            client.get_election_types_by_process(110)
+            self.assertEqual(len(transport.calls), 4)
+            self.assertEqual(persistent.stats.hits, 1)
+            persistent.close()
+            cache.tiers[1].close()
+
+    def test_sqlite_cache_eviction(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.sqlite")
+            cache = SQLiteCache(path, maxsize=2)
+            cache.set("a", 1, 60)
+            cache.set("b", 2, 60)
+            cache.set("b", 3, 60)
+            self.assertEqual((len(cache), cache.stats.evictions), (2, 0))
+            cache.set("c", 4, 60)
+            self.assertEqual((len(cache), cache.stats.evictions), (2, 1))
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("c"), 4)
+            cache.close()
+            cache = SQLiteCache(path, maxsize=2)
+            self.assertEqual(len(cache), 2)
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+            cache.close()
+
+    def test_memory_cache_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        for key in "abc":
+            cache.set(key, {"key": key}, ttl=60)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), {"key": "c"})
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_entity_parse(self):
+        resume = Resume.parse({
+            "oDatosPersonales": {"strNombres": "ANA", "strFechaNacimiento": "01/02/1980"},
+            "lSentenciaPenal": [{"strTengoSentenciaPenal": "2"}],
+            "strUnknown": "x",
+        })
+        self.assertEqual(type(resume).__dictoffset__, 0)  # no per-instance __dict__
+        self.assertEqual(resume.oDatosPersonales.strNombres, "ANA")
+        self.assertEqual(resume.strUnknown, "x")
+        self.assertIsNone(resume.strMissing)
+        self.assertEqual(resume.lSentenciaPenal.exclude_empty_item, [])
+        clone = pickle.loads(pickle.dumps(resume))
+        self.assertEqual(clone.oDatosPersonales.fechaNacimiento.year, 1980)
+        self.assertEqual(clone.strUnknown, "x")
+
+        file = File.parse({"idExpediente": 1, "anything": 2})
+        self.assertEqual(file.to_dict(), {"idExpediente": 1, "anything": 2})
+        # fields not declared can still be assigned, as before slots
+        file.anything = 3
+        file.strNew = "x"
+        file.idExpediente = 4
+        self.assertEqual(file.to_dict(), {"idExpediente": 4, "anything": 3, "strNew": "x"})
+        with self.assertRaises(AttributeError):
+            resume.oDatosPersonales.fechaNacimiento = None
+
+    def test_lazy_entity_parse(self):
+        json = {
+            "oDatosPersonales": {"strNombres": "ANA"},
+            "lSentenciaPenal": [{"strTengoSentenciaPenal": "1"}],
+        }
+        resume = Resume.parse(json, lazy=True)
+        self.assertEqual(resume._raw, json)
+        self.assertEqual(resume.oDatosPersonales.strNombres, "ANA")
+        self.assertIs(resume.oDatosPersonales, resume.oDatosPersonales)
+        self.assertEqual(list(resume._raw), ["lSentenciaPenal"])
+        clone = pickle.loads(pickle.dumps(resume))
+        self.assertEqual(clone.lSentenciaPenal[0].strTengoSentenciaPenal, "1")
+
+        # a section shared between threads is parsed once
+        resume = Resume.parse(json, lazy=True)
+        start = threading.Barrier(8)
+        results = []
+
+        def read():
+            start.wait()
+            results.append(resume.lSentenciaPenal)
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_parse_datetime(self):
+        self.assertEqual(parse_date("05/03/2021"), date(2021, 3, 5))
+        self.assertEqual(parse_datetime("05/03/2021 10:20:30"), datetime(2021, 3, 5, 10, 20, 30))
+        self.assertEqual(
+            parse_datetime("05/03/2021 01:20:30 p. m.", format="%d/%m/%Y %H:%M:%S %p"),
+            datetime(2021, 3, 5, 13, 20, 30),
+        )
+        self.assertEqual(
+            parse_datetime("05/03/2021 12:20:30 AM", format="%d/%m/%Y %H:%M:%S %p"),
+            datetime(2021, 3, 5, 0, 20, 30),
+        )
+        # not fixed width, handled by strptime
+        self.assertEqual(parse_date("5/3/2021"), date(2021, 3, 5))
+        self.assertEqual(parse_datetime("2021-03-05", format="%Y-%m-%d"), datetime(2021, 3, 5))
+
+        # the fast path agrees with strptime, including on the 12-hour clock
+        values = [
+            "05/03/2021", "05/03/2021 01:20:30", "05/03/2021 13:20:30", "05/03/2021 1:20:30",
+            "05/03/2021 01:20:30 PM", "05/03/2021 1:20:30 PM", "05/03/2021 12:20:30 a. m.",
+            "05/03/2021 13:20:30 p.m.", "05/03/2021 00:20:30 AM", "05/03/2021 01:20:30 XM",
+        ]
+        for format in sorted(FAST_FORMATS):
+            for value in values:
+                try:
+                    expected = _strptime(value, format)
+                except ValueError:
+                    expected = None
+                try:
+                    fast = _parse_fixed_datetime(value, " " in format, "%p" in format)
+                except (ValueError, IndexError):
+                    fast = expected
+                self.assertEqual((value, format, fast), (value, format, expected))
+                if expected is None:
+                    with self.assertRaises(ValueError):
+                        parse_datetime(value, format)
+                else:
+                    self.assertEqual(parse_datetime(value, format), expected)
+        for value in ("05/03/2021 01:20:30 PM", "05/03/2021 1:20:30 PM"):
+            self.assertEqual(parse_datetime(value, "%d/%m/%Y %H:%M:%S %p"), datetime(2021, 3, 5, 13, 20, 30))
+        with self.assertRaises(ValueError):
+            parse_date("05/03/2021 01:20:30")
+
+        candidate = Candidate.parse({"strFechaNacimiento": "01/02/1980 12:00:00 a. m."})
+        self.assertEqual(candidate.fechaNacimiento, datetime(1980, 2, 1))
+        self.assertIs(candidate.fechaNacimiento, candidate.fechaNacimiento)
+
+    def test_stream_files(self):
+        files = [{"idExpediente": i, "strOrganizacionPolitica": "PARTIDO"} for i in range(100)]
+        transport = FakeTransport({
+            "/Expediente/BusquedaReporteAvanzadoExpediente": FakeResponse({"data": files, "success": True}),
+        })
+        client = JNE(transport=transport)
+        client.stream_chunk_size = 7
+        stream = client.get_files(proceso_electoral=110, stream=True)
+        self.assertEqual(transport.calls, [])
+        self.assertEqual([file.idExpediente for file in stream], list(range(100)))
+        # a byte order mark, even split across chunks, is skipped
+        content = b"\xef\xbb\xbf" + json.dumps({"data": files}).encode()
+        items = iter_json_array(content[i:i + 2] for i in range(0, len(content), 2))
+        self.assertEqual([item["idExpediente"] for item in items], list(range(100)))
+
+    def test_stream_backpressure(self):
+        sentences = [{"strExpedientePenal": str(i)} for i in range(50)]
+        transport = FakeTransport({"/HojaVida/GetAllHVSentenciaPenal": FakeResponse({"data": sentences})})
+        client = JNE(transport=transport, stream_prefetch=5)
+        stream = client.get_resume_penal_sentence(1, stream=True)
+        self.assertEqual([item.strExpedientePenal for item in stream], [str(i) for i in range(50)])
+
+        produced = []
+
+        def source():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        items = prefetch(source(), maxsize=3)
+        self.assertEqual(next(items), 0)
+        time.sleep(0.05)
+        # bounded: the producer waits for the consumer
+        self.assertLessEqual(len(produced), 6)
+        items.close()
+
+        def failing():
+            yield 1
+            raise JNEException("boom")
+
+        with self.assertRaises(JNEException):
+            list(prefetch(failing()))
+        parsed = PenalSentence.iter_parse_list(iter(sentences))
+        self.assertEqual(next(parsed).strExpedientePenal, "0")
+
+    def test_interning(self):
+        content = json.dumps({"data": [
+            {"idExpediente": i, "strOrganizacionPolitica": "PARTIDO MORADO", "strEstado": "INSCRITO",
+             "lParteProcesal": [{"strJuradoElectoral": "JEE LIMA CENTRO"}]}
+            for i in range(50)
+        ]}).encode()
+        plain = EntityParser()
+        files = plain.parse(plain.decode(content), payload_list=True, payload_type="file")
+        table = InternTable()
+        parser = EntityParser(intern=table)
+        interned = parser.parse(parser.decode(content), payload_list=True, payload_type="file")
+
+        self.assertEqual(to_json_value(interned), to_json_value(files))
+        self.assertIs(interned[0].strOrganizacionPolitica, interned[1].strOrganizacionPolitica)
+        self.assertIs(interned[0].strEstado, interned[1].strEstado)
+        self.assertIs(
+            interned[0].lParteProcesal[0].strJuradoElectoral, interned[1].lParteProcesal[0].strJuradoElectoral
+        )
+        self.assertIsNotNone(table.values.get("INSCRITO"))
+
+        report, plain_report = memory_report(interned), memory_report(files)
+        self.assertEqual(report.references, plain_report.references)
+        self.assertEqual(report.values, plain_report.values)
+        self.assertEqual(report.objects, report.values)
+        self.assertGreater(report.saved, plain_report.saved)
+        self.assertEqual(report.nbytes, report.nbytes_interned)
+
+        lazy = EntityParser(lazy=True, intern=table)
+        stream = list(lazy.iter_parse(json.loads(content)["data"], "file"))
+        self.assertIs(stream[0].strEstado, interned[0].strEstado)
+        # lazy sections are interned when parsed
+        self.assertIs(
+            stream[0].lParteProcesal[0].strJuradoElectoral, interned[0].lParteProcesal[0].strJuradoElectoral
+        )
+        plain_lazy = EntityParser(lazy=True).parse(json.loads(content), payload_list=True, payload_type="file")
+        self.assertEqual(memory_report(stream[1:]).references, memory_report(plain_lazy[1:]).references)
+        self.assertEqual(to_json_value(pickle.loads(pickle.dumps(stream[1]))), to_json_value(files[1]))
+
+    def test_json_backends(self):
+        content = json.dumps({"data": [{"idExpediente": 1}]}).encode("utf-8-sig")
+        for backend in (None, "json"):
+            parser = EntityParser(json_backend=backend)
+            result = parser.parse(parser.decode(content), payload_list=True, payload_type="file")
+            self.assertEqual(result[0].idExpediente, 1)
+        with self.assertRaises(JNEException):
+            EntityParser(json_backend="not_a_json_library")
+        with self.assertRaises(JNEException):
+            EntityParser().decode(b"<html>")
+
+    def test_rate_limiter(self):
+        # a token is refilled every 0.02 seconds, as long as each reading of the clock
+        limiter = RateLimiter(rate=50, burst=1, clock=FakeClock(step=0.02))
+        client = JNE(transport=FakeTransport({
+            "/Resoluciones/GetListProcesosCR": FakeResponse({"data": []}),
+        }), rate_limiter=limiter)
+        for _ in range(6):
+            client.get_election_processes()
+        self.assertEqual(limiter.stats()["successes"], 6)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+        clock = FakeClock()
+        limiter = RateLimiter(rate=50, burst=1, clock=clock)
+        limiter.acquire()
+        limiter.release(latency=0)
+        acquired = threading.Event()
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+        # no token until the clock moves
+        self.assertFalse(acquired.wait(0.1))
+        clock.advance(0.02)
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+        self.assertEqual(limiter.stats()["in_flight"], 1)
+
+    def test_adaptive_rate_limiter(self):
+        limiter = RateLimiter(rate=10, concurrency=4, adaptive=True, cooldown=60)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(latency=0.1, ok=True)
+        self.assertGreater(limiter.rate, 10)
+        self.assertGreater(limiter.concurrency, 4)
+        rate = limiter.rate
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(latency=0.1, ok=False)
+        # decreased once within the cooldown
+        self.assertAlmostEqual(limiter.rate, rate / 2)
+
+    def test_retry(self):
+        transport = FakeTransport({
+            "/Resoluciones/GetListProcesosCR": [
+                ConnectionResetError(),
+                FakeResponse({}, status_code=503, headers={"Retry-After": "0"}),
+                FakeResponse({"data": [{"idProcesoElectoral": 110}]}),
+            ],
+            "/Expediente/BuscandoCodigo": [FakeResponse({}, status_code=500)] * 2,
+        })
+        policy = RetryPolicy(backoff_factor=0.001)
+        client = JNE(transport=transport, retry_policies={"/Resoluciones/": policy})
+        self.assertEqual(client.get_election_processes()[0].idProcesoElectoral, 110)
+        self.assertEqual(len(transport.calls), 3)
+        # no policy for this path
+        with self.assertRaises(JNEException):
+            client.get_file("ABC")
+        self.assertEqual(len(transport.calls), 4)
+
+    def test_circuit_breaker(self):
+        transport = FakeTransport({
+            "/Resoluciones/GetListProcesosCR": [FakeResponse({}, status_code=500)] * 2 + [
+                FakeResponse({"data": []})
+            ],
+        })
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=clock)
+        client = JNE(transport=transport, retry_policies={}, circuit_breaker=breaker)
+        for _ in range(2):
+            self.assertRaises(JNEException, client.get_election_processes)
+        self.assertRaises(CircuitOpenError, client.get_election_processes)
+        clock.advance(29)
+        self.assertRaises(CircuitOpenError, client.get_election_processes)
+        self.assertEqual(len(transport.calls), 2)
+        clock.advance(1)
+        client.get_election_processes()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_record_and_replay(self):
+        transport = FakeTransport({
+            "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            "/Expediente/BusquedaReporteAvanzadoExpediente": FakeResponse({"data": [{"idExpediente": 7}]}),
+        })
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = JNE(transport=RecordingTransport(transport, Cassette(tmpdir)))
+            client.get_election_types_by_process(110)
+            client.get_files(proceso_electoral=110)
+
+            cassette = Cassette(tmpdir)
+            self.assertEqual(len(cassette), 2)
+            client = JNE(transport=ReplayTransport(cassette))
+            self.assertEqual(client.get_files(proceso_electoral=110)[0].idExpediente, 7)
+
+            with StandInServer(cassette, payload_scale=3) as server:
+                with JNE(retry_policies={}) as client:
+                    client.base_url = server.base_url
+                    self.assertEqual(len(client.get_election_types_by_process(110)), 3)
+                    self.assertEqual(len(client.get_files(proceso_electoral=110)), 3)
+                    self.assertRaises(JNEException, client.get_files, proceso_electoral=111)
+                    server.error_rate = 1
+                    self.assertRaises(JNEException, client.get_election_types_by_process, 110)
+
+        class AnyPathTransport(FakeTransport):
+            def request(self, method, url, params=None, data=None, stream=False):
+                path = url.split(".gob.pe", 1)[-1]
+                self.responses.setdefault(path, FakeResponse({"data": []}))
+                return super().request(method, url, params, data, stream)
+
+        transport = AnyPathTransport({
+            "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            "/Candidato/GetExpedientesLista/110-1-null------0-": FakeResponse({"data": [{"idExpediente": 7, "idSolicitudLista": 3}]}),
+            "/Candidato/GetCandidatos/1-110-3-7": FakeResponse({"data": [{"idHojaVida": 5, "idOrganizacionPolitica": 9}]}),
+        })
+        record_endpoints(JNE(transport=transport), 110)
+        paths = [url.split(".gob.pe", 1)[-1] for _, url, _, _ in transport.calls]
+        self.assertEqual(len(paths), len(set(paths)))
+        # the consolidated resume, the personal info and every section once
+        self.assertEqual(len([path for path in paths if path.startswith("/HojaVida/")]), len(RESUME_SECTIONS) + 2)
+
+    def test_metrics(self):
+        transport = FakeTransport({
+            "/Candidato/GetTipoEleccionbyProceso/110": FakeResponse({"data": [{"idTipoEleccion": 1}]}),
+            "/Resoluciones/GetListProcesosCR": [
+                FakeResponse({}, status_code=503, headers={"Retry-After": "0"}),
+                FakeResponse({"data": []}),
+            ],
+        })
+        client = JNE(transport=transport, cache=MemoryCache())
+        metrics, events = Metrics(), []
+        client.add_hook(metrics)
+        client.add_hook(lambda event, data: events.append(event))
+        client.get_election_types_by_process(110)
+        client.get_election_types_by_process(110)
+        client.get_election_processes()
+        self.assertEqual(
+            events,
+            ["cache", "response", "decode", "parse", "cache", "parse",
+             "cache", "response", "retry", "response", "decode", "parse"],
+        )
+        text = metrics.to_prometheus()
+        self.assertIn('pyjne_requests_total{endpoint="GetTipoEleccionbyProceso",status="200"} 1', text)
+        self.assertIn('pyjne_requests_total{endpoint="GetListProcesosCR",status="503"} 1', text)
+        self.assertIn('pyjne_cache_hits_total{endpoint="GetTipoEleccionbyProceso"} 1', text)
+        self.assertIn('pyjne_retries_total{endpoint="GetListProcesosCR"} 1', text)
+        self.assertIn(
+            'pyjne_request_duration_seconds_count{endpoint="GetTipoEleccionbyProceso",phase="parse"} 2', text
+        )
+        self.assertIn('pyjne_response_content_bytes_total{endpoint="GetTipoEleccionbyProceso"} 33', text)
+
+        # a failing hook is logged, the request goes on
+        def failing_hook(event, data):
+            raise ValueError("boom")
+
+        client.add_hook(failing_hook)
+        with self.assertLogs("pyjne_peru.client", "ERROR"):
+            self.assertEqual(client.get_election_types_by_process(110)[0].idTipoEleccion, 1)
+
+        async def fetch():
+            transport = FakeAsyncTransport({"/Resoluciones/GetListProcesosCR": FakeResponse({"data": []})})
+            async with AsyncJNE(transport=transport) as client:
+                client.add_hook(failing_hook)
+                return await client.get_election_processes()
+
+        with self.assertLogs("pyjne_peru.client", "ERROR"):
+            self.assertEqual(len(asyncio.run(fetch())), 0)
+
+    def test_result_set_indexes(self):
+        candidates = Candidate.parse_list([
+            {"idHojaVida": i, "idOrganizacionPolitica": i % 3, "strCargo": "DIPUTADO" if i % 2 else "SENADOR"}
+            for i in range(10)
+        ])
+        self.assertEqual(candidates.get_by("idHojaVida", 4).idOrganizacionPolitica, 1)
+        self.assertEqual([c.idHojaVida for c in candidates.filter_by("idOrganizacionPolitica", 0)], [0, 3, 6, 9])
+        self.assertEqual(sorted(candidates.group_by("strCargo")), ["DIPUTADO", "SENADOR"])
+        view = candidates.where(idOrganizacionPolitica=0, strCargo="DIPUTADO")
+        self.assertEqual([c.idHojaVida for c in view], [3, 9])
+        self.assertIs(candidates.where(strCargo="DIPUTADO", idOrganizacionPolitica=0), view)
+        self.assertEqual(candidates.where(), list(candidates))
+        # lookups of the other kind keep the declared uniqueness
+        self.assertEqual([c.idOrganizacionPolitica for c in candidates.filter_by("idHojaVida", 4)], [1])
+        self.assertEqual(candidates.where(idHojaVida=5)[0].strCargo, "DIPUTADO")
+        self.assertEqual(candidates.indexes["idHojaVida"], True)
+        index = candidates.get_index("idHojaVida")
+        self.assertIs(candidates.get_by("idHojaVida", 4), index[4])
+        self.assertIs(candidates.get_index("idHojaVida"), index)
+        self.assertEqual(candidates.get_by("idOrganizacionPolitica", 2).idHojaVida, 2)
+        self.assertEqual(candidates.indexes["idOrganizacionPolitica"], False)
+
+        candidates.append(Candidate.parse({"idHojaVida": 10, "idOrganizacionPolitica": 0, "strCargo": "DIPUTADO"}))
+        self.assertEqual(candidates.get_by("idHojaVida", 10).strCargo, "DIPUTADO")
+        self.assertEqual(len(candidates.where(idOrganizacionPolitica=0, strCargo="DIPUTADO")), 3)
+        del candidates[0]
+        self.assertIsNone(candidates.get_by("idHojaVida", 0))
+
+        clone = pickle.loads(pickle.dumps(candidates))
+        self.assertEqual(clone.get_by("idHojaVida", 10).idOrganizacionPolitica, 0)
+        self.assertEqual(clone.total, 10)
+
+    def test_candidate_search_index(self):
+        index = CandidateSearchIndex()
+        index.add_many(Candidate.parse_list([
+            {"idHojaVida": 1, "strCandidato": "JOSÉ NÚÑEZ PEÑA", "idOrganizacionPolitica": 10},
+            {"idHojaVida": 2, "strCandidato": "MARÍA NUÑEZ GUTIÉRREZ", "idOrganizacionPolitica": 20},
+            {"idHojaVida": 3, "strCandidato": "JOSEFINA ROJAS", "idOrganizacionPolitica": 10},
+        ]), idTipoEleccion=1)
+        index.add(
+            Candidate.parse({"idHojaVida": 4, "idOrganizacionPolitica": 20}),
+            PersonalInfo.parse({"strNombres": "ANA", "strApellidoPaterno": "PEÑA"}),
+            idTipoEleccion=2,
+        )
+        self.assertEqual([hit.candidate.idHojaVida for hit in index.search("nunez")], [1, 2])
+        self.assertEqual([hit.candidate.idHojaVida for hit in index.search("jose")], [1, 3])
+        self.assertEqual([hit.candidate.idHojaVida for hit in index.search("Jose Nunez")], [1])
+        self.assertEqual([hit.candidate.idHojaVida for hit in index.search("gutieres")], [2])
+        self.assertEqual([hit.candidate.idHojaVida for hit in index.search("pena", idTipoEleccion=2)], [4])
+        self.assertEqual(index.search("nunez", idOrganizacionPolitica=30), [])
+        index.remove(1)
+        self.assertEqual([hit.candidate.idHojaVida for hit in index.search("nunez")], [2])
+        self.assertEqual(len(index), 3)
+        for key in (2, 3, 4):
+            index.remove(key)
+        self.assertEqual((index._trigrams, index._postings, index._facets), ({}, {}, {}))
+
+        def record(id_hoja_vida, id_tipo_eleccion, departamento):
+            return CandidateRecord(
+                110, ElectionType.parse({"idTipoEleccion": id_tipo_eleccion}), None,
+                Candidate.parse({"idHojaVida": id_hoja_vida, "idOrganizacionPolitica": 9}),
+                Resume.parse({"oDatosPersonales": {
+                    "strNombres": "LUIS", "strApellidoPaterno": "QUISPE", "strPostulaDepartamento": departamento,
+                }}),
+            )
+
+        index.add_records([record(5, 1, "LIMA"), record(6, 1, "CUSCO"), record(7, 2, "CUSCO")])
+        hits = index.search("quispe", strPostulaDepartamento="CUSCO", idTipoEleccion=1)
+        self.assertEqual([hit.candidate.idHojaVida for hit in hits], [6])
+        self.assertEqual(hits[0].personal_info.strPostulaDepartamento, "CUSCO")
+
+    def test_warehouse(self):
+        election_type = ElectionType.parse({"idTipoEleccion": 1})
+        file = File.parse({"idExpediente": 7, "idOrganizacionPolitica": 9, "lParteProcesal": [{"strNombre": "X"}]})
+
+        def record(id_hoja_vida, sentences):
+            return CandidateRecord(
+                110, election_type, file,
+                Candidate.parse({"idHojaVida": id_hoja_vida, "idOrganizacionPolitica": 9, "strCargo": "DIPUTADO"}),
+                Resume.parse({
+                    "oDatosPersonales": {"strNombres": "ANA"},
+                    "lSentenciaPenal": [{"strTengoSentenciaPenal": "1", "strDelitoPenal": d} for d in sentences],
+                }),
+            )
+
+        with tempfile.TemporaryDirectory() as tmpdir, Warehouse(os.path.join(tmpdir, "jne.sqlite"), batch_size=2) as warehouse:
+            self.assertEqual(warehouse.sync_records([record(1, ["A", "B"]), record(2, []), record(3, ["C"])]), 3)
+            # a new version of the resume replaces the previous one
+            warehouse.sync_records([record(1, ["D"])])
+            rows = warehouse.query(
+                'SELECT c."idHojaVida", p."strNombres", c."strCargo" FROM candidate c '
+                'JOIN resume_personal_info p ON p."idHojaVida" = c."idHojaVida" ORDER BY 1'
+            )
+            self.assertEqual([tuple(row) for row in rows], [
+                (1, "ANA", "DIPUTADO"), (2, "ANA", "DIPUTADO"), (3, "ANA", "DIPUTADO"),
+            ])
+            rows = warehouse.query(
+                'SELECT "idHojaVida", "strTengoSentenciaPenal", "strDelitoPenal", "extra" '
+                'FROM resume_penal_sentence ORDER BY 1, "position"'
+            )
+            self.assertEqual([tuple(row) for row in rows], [(1, "1", "D", None), (3, "1", "C", None)])
+            row = warehouse.query('SELECT "lParteProcesal", "idProcesoElectoral" FROM file')[0]
+            self.assertEqual((json.loads(row[0]), row[1]), ([{"strNombre": "X"}], 110))
+
+    def test_warehouse_migration(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "jne.sqlite")
+            # a candidate table created before "strCargo" was a column
+            with sqlite3.connect(path) as conn:
+                conn.execute(
+                    'CREATE TABLE "candidate" ("idProcesoElectoral", "idHojaVida", "idOrganizacionPolitica", '
+                    '"extra", PRIMARY KEY ("idProcesoElectoral", "idHojaVida", "idOrganizacionPolitica"))'
+                )
+                conn.execute('INSERT INTO "candidate" VALUES (110, 1, 9, \'{"strCargo": "SENADOR"}\')')
+            conn.close()
+            with Warehouse(path) as warehouse:
+                candidate = Candidate.parse({"idHojaVida": 2, "idOrganizacionPolitica": 9, "strCargo": "DIPUTADO"})
+                warehouse.sync_candidates([candidate], idProcesoElectoral=110)
+                rows = warehouse.query('SELECT "idHojaVida", "strCargo", "extra" FROM candidate ORDER BY 1')
+                self.assertEqual([tuple(row) for row in rows], [
+                    (1, None, '{"strCargo": "SENADOR"}'), (2, "DIPUTADO", None),
+                ])